@@ -2,9 +2,37 @@
 Admin configuration cho Business Scraper
 """
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import SearchQuery, Business
 
 
+class LargeTablePaginator(Paginator):
+    """
+    Paginator dùng số dòng ước lượng của PostgreSQL (pg_class.reltuples)
+    thay cho COUNT(*) khi queryset không có filter. Bảng nhỏ hoặc khi có
+    filter/search vẫn dùng count chính xác.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[self.object_list.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples FROM pg_class WHERE relname = %s",
+                        [query.model._meta.db_table]
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] >= self.estimate_threshold:
+                    return int(row[0])
+        return super().count
+
+
 @admin.register(SearchQuery)
 class SearchQueryAdmin(admin.ModelAdmin):
     list_display = ['keyword', 'location', 'total_results', 'status', 'created_at']
@@ -12,15 +40,22 @@ class SearchQueryAdmin(admin.ModelAdmin):
     search_fields = ['keyword', 'location']
     readonly_fields = ['created_at']
     ordering = ['-created_at']
+    paginator = LargeTablePaginator
+    show_full_result_count = False
 
 
 @admin.register(Business)
 class BusinessAdmin(admin.ModelAdmin):
     list_display = ['name', 'phone', 'email', 'address', 'rating', 'created_at']
     list_filter = ['created_at', 'category']
-    search_fields = ['name', 'phone', 'email', 'address']
+    search_fields = ['^name', '=phone', '=email']
+    sortable_by = ('created_at',)
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ('search_query',)
     ordering = ['-created_at']
+    list_select_related = ('search_query',)
+    paginator = LargeTablePaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Thông tin cơ bản', {
@@ -39,3 +74,14 @@ class BusinessAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related('search_query')
+        # Trang danh sách chỉ cần các cột hiển thị; trang chi tiết vẫn load đủ field
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith('_changelist'):
+            qs = qs.only(
+                'id', 'name', 'phone', 'email', 'address', 'rating', 'created_at',
+                'search_query', 'search_query__keyword',
+            )
+        return qs
@@ -2,14 +2,186 @@
 Service to handle interactions with Google's Gemini API
 """
 import os
+import re
+import asyncio
+import hashlib
 import logging
-import json
+import weakref
+import orjson
 import google.generativeai as genai
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, Optional, List
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator
 from django.conf import settings
+from django.core.cache import caches
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence around a JSON answer (```json ... ```)
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+# Whitespace runs that waste the prompt budget (paragraph breaks are kept
+# because _split_windows cuts on them)
+_INLINE_SPACE_RE = re.compile(r'[ \t\r\f\v\xa0]+')
+_LINE_EDGE_RE = re.compile(r' ?\n ?')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Cheap pre-filter for the mandatory phone/email: an email address or a run of
+# 8+ digits allowing the usual separators (0912 345 678, (024) 3xxx, 1900 xxxx).
+# Deliberately permissive - it only decides whether Gemini is worth calling
+_CONTACT_RE = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+|\+?\d(?:[\s.\-()]{0,2}\d){7,}')
+
+# Prompt templates - built once, only url/text are substituted per call
+_SINGLE_PROMPT = """
+You are an expert data extraction AI. Your task is to extract business information from the following website text content.
+The website URL is: {url}
+
+Please extract the following fields:
+- name: The official name of the business.
+- phone: The phone number (format as standard Vietnamese phone number if possible).
+- email: The contact email address.
+- address: The full physical address.
+- description: A brief description of what the business does (max 200 chars).
+
+Rules:
+1. If a field is not found, return null.
+2. For 'name', prioritize the business name over generic titles.
+3. For 'phone', look for Vietnamese formats (09x, 02x, +84, 03x, 05x, 07x, 08x).
+4. IGNORE and DO NOT return the result if it does not have either a 'phone' or 'email'.
+5. Return ONLY a valid JSON object. Do not include markdown formatting (```json ... ```).
+
+Text Content:
+{text}
+"""
+
+_MULTI_PROMPT = """
+You are an expert data extraction AI. The following text is from a "listing" or "directory" page that lists multiple businesses.
+The website URL is: {url}
+
+Your task is to extract a LIST of businesses found in the text.
+
+For EACH business, extract:
+- name: Business name
+- phone: Phone number
+- email: Email
+- address: Address
+- description: Brief description
+
+Rules:
+1. Return a JSON object with a key "businesses" containing a list of objects.
+2. Ignore businesses that don't have at least a phone number OR an email address.
+3. Return ONLY valid JSON.
+
+Text Content:
+{text}
+"""
+
+# JSON mode for listing extraction - response is plain JSON, no markdown fences
+_NULLABLE_STRING = {'type': 'string', 'nullable': True}
+BUSINESS_LIST_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'businesses': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'name': _NULLABLE_STRING,
+                    'phone': _NULLABLE_STRING,
+                    'email': _NULLABLE_STRING,
+                    'address': _NULLABLE_STRING,
+                    'description': _NULLABLE_STRING,
+                },
+            },
+        },
+    },
+    'required': ['businesses'],
+}
+_MULTI_GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': BUSINESS_LIST_SCHEMA,
+}
+
+
+class ExtractedBusiness(BaseModel):
+    """A business as returned by Gemini (unknown keys are dropped)"""
+    model_config = ConfigDict(extra='ignore')
+
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    description: Optional[str] = None
+
+    @field_validator('*', mode='before')
+    @classmethod
+    def _scalar_to_str(cls, value):
+        # Free-form answers sometimes give the phone as a bare number
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        return value
+
+    @property
+    def is_contactable(self) -> bool:
+        """Strict validation: must have phone OR email"""
+        return bool(self.phone or self.email)
+
+
+_BUSINESS_LIST_ADAPTER = TypeAdapter(List[ExtractedBusiness])
+
+# Prompt text budgets (characters of densified text)
+_SINGLE_MAX_CHARS = 10000
+# Listing pages are split into windows sent to Gemini concurrently
+_MULTI_WINDOW_CHARS = 15000
+_MULTI_MAX_WINDOWS = 3
+
+
+def _densify(text: str) -> str:
+    """Collapse whitespace so the character budget is spent on content"""
+    text = _LINE_EDGE_RE.sub('\n', _INLINE_SPACE_RE.sub(' ', text))
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+
+def has_contact_details(text: str, minimum: int = 1) -> bool:
+    """True if text contains at least `minimum` phone/email-like matches"""
+    return sum(1 for _ in islice(_CONTACT_RE.finditer(text), minimum)) >= minimum
+
+
+def _cut_point(text: str, start: int, end: int) -> int:
+    """
+    Best place to end a chunk text[start:end]: the last paragraph break in
+    the second half of the range, else the last whitespace, so words and
+    phone numbers are never split across the budget boundary
+    """
+    if end >= len(text):
+        return len(text)
+    middle = start + (end - start) // 2
+    cut = text.rfind('\n\n', middle, end)
+    if cut == -1:
+        cut = max(text.rfind(' ', middle, end), text.rfind('\n', middle, end))
+    return cut if cut > start else end
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Trim text to at most limit chars on a word boundary"""
+    return text[:_cut_point(text, 0, limit)]
+
+
+def _split_windows(text: str, size: int, max_windows: int) -> List[str]:
+    """
+    Split text into at most max_windows chunks of <= size chars,
+    cutting on paragraph (or word) boundaries
+    """
+    windows = []
+    start = 0
+    while start < len(text) and len(windows) < max_windows:
+        end = _cut_point(text, start, start + size)
+        windows.append(text[start:end])
+        start = end
+    return windows or [text]
+
+
 class GeminiService:
     """Service for interacting with Gemini API"""
 
@@ -20,12 +192,56 @@ class GeminiService:
             self.model = None
             return
 
+        # Max in-flight Gemini requests; one semaphore per event loop because
+        # under WSGI every async view runs on its own loop
+        self._concurrency = int(os.getenv('GEMINI_CONCURRENCY', '8'))
+        self._semaphores = weakref.WeakKeyDictionary()
+
         genai.configure(api_key=api_key)
         # Get model name from env, default to gemini-1.5-flash
         model_name = os.getenv('GEMINI_MODEL_NAME', 'gemini-2.5-flash')
         self.model = genai.GenerativeModel(model_name)
+        self._model_name = model_name
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency guard for the running event loop"""
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self._concurrency)
+        return sem
+
+    async def _generate(self, prompt: str, **kwargs) -> str:
+        """
+        Response text for the prompt, limited by GEMINI_CONCURRENCY
+
+        Answers are kept in the 'gemini' cache keyed by model + prompt (the
+        prompt holds the URL and page text), so re-scraping an unchanged page
+        doesn't call the API again. Failed calls raise and are not cached.
+        """
+        key = 'gemini:' + hashlib.sha256(
+            f"{self._model_name}\0{sorted(kwargs.items())!r}\0{prompt}".encode()
+        ).hexdigest()
+        cache = caches['gemini']
+        try:
+            text = await cache.aget(key)
+        except Exception as e:
+            logger.debug(f"Gemini cache read error: {e}")
+            text = None
+        if text is not None:
+            return text
+
+        async with self._semaphore():
+            response = await self.model.generate_content_async(prompt, **kwargs)
+        text = response.text
+
+        try:
+            await cache.aset(key, text)
+        except Exception as e:
+            logger.debug(f"Gemini cache write error: {e}")
+        return text
 
-    def extract_business_info(self, text_content: str, url: str) -> Optional[Dict]:
+    async def extract_business_info(self, text_content: str, url: str) -> Optional[Dict]:
         """
         Extract business information from text content using Gemini
 
@@ -40,107 +256,93 @@ class GeminiService:
             logger.error("Gemini model not initialized (missing API key)")
             return None
 
+        text = _truncate(_densify(text_content), _SINGLE_MAX_CHARS)
+        # No phone/email on the page - the answer would be discarded anyway
+        if not has_contact_details(text):
+            return None
+
         try:
-            prompt = f"""
-            You are an expert data extraction AI. Your task is to extract business information from the following website text content.
-            The website URL is: {url}
-
-            Please extract the following fields:
-            - name: The official name of the business.
-            - phone: The phone number (format as standard Vietnamese phone number if possible).
-            - email: The contact email address.
-            - address: The full physical address.
-            - description: A brief description of what the business does (max 200 chars).
-
-            Rules:
-            1. If a field is not found, return null.
-            2. For 'name', prioritize the business name over generic titles.
-            3. For 'phone', look for Vietnamese formats (09x, 02x, +84, 03x, 05x, 07x, 08x).
-            4. IGNORE and DO NOT return the result if it does not have either a 'phone' or 'email'.
-            5. Return ONLY a valid JSON object. Do not include markdown formatting (```json ... ```).
-
-            Text Content:
-            {text_content[:10000]}  # Limit content length to avoid token limits
-            """
-
-            response = self.model.generate_content(prompt)
-            
-            # Clean up response text to ensure it's valid JSON
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            data = json.loads(response_text.strip())
+            # Limit content length to avoid token limits
+            prompt = _SINGLE_PROMPT.format(url=url, text=text)
+
+            response_text = await self._generate(prompt)
             
-            # Strict validation: Must have phone OR email
-            if not (data.get('phone') or data.get('email')):
+            # Strip markdown fences (if any), parse and validate
+            business = ExtractedBusiness.model_validate_json(_FENCE_RE.sub('', response_text))
+            if not business.is_contactable:
                 return None
-                
+
             # Add source and website
-            data['website'] = url
-            data['source'] = 'duckduckgo_ai'
-            
-            return data
+            return business.model_dump(exclude_none=True) | {'website': url, 'source': 'duckduckgo_ai'}
 
         except Exception as e:
             logger.error(f"Gemini extraction error for {url}: {str(e)}")
             return None
 
-    def extract_multiple_businesses(self, text_content: str, url: str) -> List[Dict]:
+    async def extract_multiple_businesses(self, text_content: str, url: str) -> Optional[List[Dict]]:
         """
         Extract MULTIPLE businesses from a listing page (e.g. Top 10 list)
+
+        Long pages are split into paragraph-aligned windows which are
+        extracted concurrently in JSON mode.
+
+        Returns:
+            List of business dicts - empty when Gemini read the page and found
+            no contactable business - or None when the page wasn't checked
+            (not a listing, or every Gemini call failed)
         """
         if not self.model:
-            return []
+            return None
 
-        try:
-            prompt = f"""
-            You are an expert data extraction AI. The following text is from a "listing" or "directory" page that lists multiple businesses.
-            The website URL is: {url}
+        # A listing needs contacts for at least two businesses; other pages are
+        # left to extract_business_info. Windows without any contact are skipped
+        text = _densify(text_content)
+        if not has_contact_details(text, minimum=2):
+            return None
+        windows = [
+            window
+            for window in _split_windows(text, _MULTI_WINDOW_CHARS, _MULTI_MAX_WINDOWS)
+            if has_contact_details(window)
+        ]
 
-            Your task is to extract a LIST of businesses found in the text.
+        responses = await asyncio.gather(
+            *[
+                self._generate(
+                    _MULTI_PROMPT.format(url=url, text=window),
+                    generation_config=_MULTI_GENERATION_CONFIG
+                )
+                for window in windows
+            ],
+            return_exceptions=True
+        )
 
-            For EACH business, extract:
-            - name: Business name
-            - phone: Phone number
-            - email: Email
-            - address: Address
-            - description: Brief description
+        # Filter and add metadata
+        valid_businesses = []
+        answered = False
+        for response in responses:
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                result = orjson.loads(response)
+                businesses = _BUSINESS_LIST_ADAPTER.validate_python(result.get('businesses', []))
+            except Exception as e:
+                logger.error(f"Gemini multiple extraction error: {str(e)}")
+                continue
 
-            Rules:
-            1. Return a JSON object with a key "businesses" containing a list of objects.
-            2. Ignore businesses that don't have at least a phone number OR an email address.
-            3. Return ONLY valid JSON.
+            answered = True
 
-            Text Content:
-            {text_content[:15000]}
-            """
+            valid_businesses.extend(
+                b.model_dump(exclude_none=True) | {'website': url, 'source': 'duckduckgo_ai'}
+                for b in businesses
+                if b.is_contactable
+            )
 
-            response = self.model.generate_content(prompt)
-            
-            # Clean up response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-
-            result = json.loads(response_text.strip())
-            businesses = result.get('businesses', [])
-            
-            # Filter and add metadata
-            valid_businesses = []
-            for b in businesses:
-                # Strict validation: Must have phone OR email
-                if b.get('phone') or b.get('email'):
-                    b['website'] = url
-                    b['source'] = 'duckduckgo_ai'
-                    valid_businesses.append(b)
-            
-            return valid_businesses
+        return valid_businesses if answered else None
 
-        except Exception as e:
-            logger.error(f"Gemini multiple extraction error: {str(e)}")
-            return []
+
+@lru_cache(maxsize=1)
+def get_gemini_service() -> GeminiService:
+    """
+    Shared GeminiService instance (configured once per process)
+    """
+    return GeminiService()
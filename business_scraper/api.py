@@ -1,25 +1,106 @@
 """
 API endpoints sử dụng Django Ninja
 """
+import asyncio
 import logging
-from typing import List
-from ninja import Router
+from concurrent.futures import Future
+from typing import List, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from ninja import Router, Query
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from .models import SearchQuery, Business
 from .schemas import (
     ScrapeRequestSchema,
     HSCTVNScrapeRequestSchema,
     ScrapeResponseSchema,
-    SearchQuerySchema,
     SearchQueryDetailSchema,
+    SearchQueryPageSchema,
     BusinessSchema,
+    BusinessPageSchema,
     ErrorSchema
 )
-from .services import BusinessScraperService
+from .services import get_scraper_service
+from .response_cache import cache_list_response
+from .renderers import dumps
 
 logger = logging.getLogger(__name__)
 router = Router()
-scraper_service = BusinessScraperService()
+
+MAX_PAGE_SIZE = 1000
+
+# Các lần scrape đang chạy, theo (source, tham số). concurrent.futures.Future
+# để request chạy trên event loop khác (WSGI) vẫn await được
+_inflight: Dict[Tuple, Future] = {}
+# Giữ tham chiếu tới task scrape đang chạy (event loop chỉ giữ weakref)
+_scrape_tasks = set()
+
+
+def _finish_inflight(key: Tuple, future: Future, task: asyncio.Task) -> None:
+    """Chuyển kết quả của task scrape sang future dùng chung"""
+    _scrape_tasks.discard(task)
+    _inflight.pop(key, None)
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+async def _coalesced(key: Tuple, scrape: Callable[[], Awaitable[SearchQuery]]) -> SearchQuery:
+    """
+    Gộp các request scrape giống nhau chạy đồng thời: request đầu tiên chạy
+    scrape, các request sau chờ và nhận cùng kết quả (hoặc cùng exception)
+
+    Scrape chạy thành task riêng và mọi request (kể cả request đầu tiên)
+    chờ qua shield: client ngắt kết nối chỉ hủy request của nó, không hủy
+    scrape hay kết quả mà các request khác đang chờ.
+    """
+    # setdefault: lấy chỗ một bước (atomic), hai request trên hai thread
+    # không thể cùng chạy scrape
+    new = Future()
+    future = _inflight.setdefault(key, new)
+    if future is new:
+        task = asyncio.ensure_future(scrape())
+        _scrape_tasks.add(task)
+        task.add_done_callback(lambda t: _finish_inflight(key, new, t))
+
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+async def _stream_json_array(rows: AsyncIterator[Dict]):
+    """Encode từng dòng thành JSON array mà không giữ toàn bộ kết quả trong bộ nhớ"""
+    yield b'['
+    separator = b''
+    async for row in rows:
+        yield separator + dumps(row)
+        separator = b','
+    yield b']'
+
+
+async def _stream_json_page(rows: AsyncIterator[Dict], limit: int):
+    """Encode một trang keyset dạng {"results": [...], "next_cursor": id}"""
+    yield b'{"results": ['
+    separator = b''
+    count = 0
+    last_id = None
+    async for row in rows:
+        yield separator + dumps(row)
+        separator = b','
+        count += 1
+        last_id = row['id']
+    next_cursor = last_id if count == limit else None
+    yield b'], "next_cursor": ' + dumps(next_cursor) + b'}'
+
+
+def _json_stream_response(rows: AsyncIterator[Dict]) -> StreamingHttpResponse:
+    return StreamingHttpResponse(_stream_json_array(rows), content_type='application/json')
+
+
+def _json_page_response(rows: AsyncIterator[Dict], limit: int) -> StreamingHttpResponse:
+    return StreamingHttpResponse(_stream_json_page(rows, limit), content_type='application/json')
 
 
 @router.post("/scrape", response={200: ScrapeResponseSchema, 400: ErrorSchema, 500: ErrorSchema})
@@ -34,10 +115,13 @@ async def scrape_google_maps(request, payload: ScrapeRequestSchema):
         ScrapeResponseSchema: Kết quả scraping
     """
     try:
-        search_query = await scraper_service.scrape_and_save(
-            keyword=payload.keyword,
-            location=payload.location,
-            max_results=payload.max_results
+        search_query = await _coalesced(
+            ('google_maps', payload.keyword, payload.location, payload.max_results),
+            lambda: get_scraper_service().scrape_and_save(
+                keyword=payload.keyword,
+                location=payload.location,
+                max_results=payload.max_results
+            )
         )
 
         return 200, {
@@ -67,10 +151,14 @@ async def scrape_duckduckgo(request, payload: ScrapeRequestSchema):
         ScrapeResponseSchema: Kết quả scraping
     """
     try:
-        search_query = await scraper_service.scrape_duckduckgo_and_save(
-            keyword=payload.keyword,
-            location=payload.location,
-            max_results=payload.max_results if payload.max_results <= 20 else 10
+        max_results = payload.max_results if payload.max_results <= 20 else 10
+        search_query = await _coalesced(
+            ('duckduckgo', payload.keyword, payload.location, max_results),
+            lambda: get_scraper_service().scrape_duckduckgo_and_save(
+                keyword=payload.keyword,
+                location=payload.location,
+                max_results=max_results
+            )
         )
 
         return 200, {
@@ -88,6 +176,47 @@ async def scrape_duckduckgo(request, payload: ScrapeRequestSchema):
         }
 
 
+@router.post("/scrape/all", response={200: List[ScrapeResponseSchema], 400: ErrorSchema, 500: ErrorSchema})
+async def scrape_all_sources(request, payload: ScrapeRequestSchema):
+    """
+    Endpoint để scrape đồng thời Google Maps và DuckDuckGo cho cùng từ khóa
+
+    Args:
+        payload: ScrapeRequestSchema chứa keyword, location, max_results
+
+    Returns:
+        List[ScrapeResponseSchema]: Kết quả của từng nguồn thành công
+    """
+    try:
+        duckduckgo_max_results = payload.max_results if payload.max_results <= 20 else 10
+        search_queries = await _coalesced(
+            ('all', payload.keyword, payload.location, payload.max_results),
+            lambda: get_scraper_service().scrape_all_sources(
+                keyword=payload.keyword,
+                location=payload.location,
+                max_results=payload.max_results,
+                duckduckgo_max_results=duckduckgo_max_results
+            )
+        )
+
+        return 200, [
+            {
+                "search_query_id": search_query.id,
+                "status": search_query.status,
+                "total_results": search_query.total_results,
+                "message": f"Đã scrape thành công {search_query.total_results} doanh nghiệp từ {search_query.get_source_display()}"
+            }
+            for search_query in search_queries
+        ]
+
+    except Exception as e:
+        logger.error(f"Lỗi khi scrape tất cả nguồn: {str(e)}")
+        return 500, {
+            "error": "Internal Server Error",
+            "detail": str(e)
+        }
+
+
 @router.post("/scrape/hsctvn", response={200: ScrapeResponseSchema, 400: ErrorSchema, 500: ErrorSchema})
 async def scrape_hsctvn(request, payload: HSCTVNScrapeRequestSchema):
     """
@@ -100,10 +229,13 @@ async def scrape_hsctvn(request, payload: HSCTVNScrapeRequestSchema):
         ScrapeResponseSchema: Kết quả scraping
     """
     try:
-        search_query = await scraper_service.scrape_hsctvn_and_save(
-            scrape_date=payload.date,
-            max_results=payload.max_results,
-            max_pages=payload.max_pages
+        search_query = await _coalesced(
+            ('hsctvn', payload.date, payload.max_results, payload.max_pages),
+            lambda: get_scraper_service().scrape_hsctvn_and_save(
+                scrape_date=payload.date,
+                max_results=payload.max_results,
+                max_pages=payload.max_pages
+            )
         )
 
         return 200, {
@@ -121,16 +253,27 @@ async def scrape_hsctvn(request, payload: HSCTVNScrapeRequestSchema):
         }
 
 
-@router.get("/searches", response=List[SearchQuerySchema])
-async def get_all_searches(request):
+@router.get("/searches", response=SearchQueryPageSchema)
+@cache_list_response
+async def get_all_searches(
+    request,
+    cursor: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)
+):
     """
-    Lấy danh sách tất cả các lần tìm kiếm
+    Lấy danh sách các lần tìm kiếm (keyset pagination, mới nhất trước)
+
+    Args:
+        cursor: next_cursor của trang trước (bỏ trống = trang đầu)
+        limit: Số bản ghi mỗi trang
 
     Returns:
-        List[SearchQuerySchema]: Danh sách search queries
+        SearchQueryPageSchema: results + next_cursor (null khi hết dữ liệu)
     """
-    search_queries = await scraper_service.get_all_search_queries()
-    return search_queries
+    return _json_page_response(
+        get_scraper_service().get_all_search_queries(cursor=cursor, limit=limit),
+        limit
+    )
 
 
 @router.get("/searches/{search_query_id}", response={200: SearchQueryDetailSchema, 404: ErrorSchema})
@@ -145,7 +288,7 @@ async def get_search_detail(request, search_query_id: int):
         SearchQueryDetailSchema: Chi tiết search query
     """
     try:
-        search_query = await scraper_service.get_search_query(search_query_id)
+        search_query = await get_scraper_service().get_search_query(search_query_id)
         return 200, search_query
 
     except SearchQuery.DoesNotExist:
@@ -155,16 +298,27 @@ async def get_search_detail(request, search_query_id: int):
         }
 
 
-@router.get("/businesses", response=List[BusinessSchema])
-async def get_all_businesses(request):
+@router.get("/businesses", response=BusinessPageSchema)
+@cache_list_response
+async def get_all_businesses(
+    request,
+    cursor: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)
+):
     """
-    Lấy danh sách tất cả các doanh nghiệp
+    Lấy danh sách doanh nghiệp (keyset pagination, mới nhất trước)
+
+    Args:
+        cursor: next_cursor của trang trước (bỏ trống = trang đầu)
+        limit: Số bản ghi mỗi trang
 
     Returns:
-        List[BusinessSchema]: Danh sách businesses
+        BusinessPageSchema: results + next_cursor (null khi hết dữ liệu)
     """
-    businesses = await scraper_service.get_all_businesses()
-    return businesses
+    return _json_page_response(
+        get_scraper_service().get_all_businesses(cursor=cursor, limit=limit),
+        limit
+    )
 
 
 @router.get("/businesses/search/{keyword}", response=List[BusinessSchema])
@@ -178,8 +332,7 @@ async def search_businesses(request, keyword: str):
     Returns:
         List[BusinessSchema]: Danh sách businesses
     """
-    businesses = await scraper_service.search_businesses_by_keyword(keyword)
-    return businesses
+    return _json_stream_response(get_scraper_service().search_businesses_by_keyword(keyword))
 
 
 @router.delete("/searches/{search_query_id}", response={200: dict, 404: ErrorSchema})
@@ -193,21 +346,16 @@ async def delete_search(request, search_query_id: int):
     Returns:
         dict: Thông báo xóa thành công
     """
-    from asgiref.sync import sync_to_async
-
-    try:
-        search_query = await sync_to_async(
-            SearchQuery.objects.get
-        )(id=search_query_id)
+    # Xóa trực tiếp bằng queryset: businesses liên quan được xóa bằng một câu
+    # DELETE ... WHERE search_query_id IN (...) thay vì load từng object
+    deleted_count, _ = await SearchQuery.objects.filter(id=search_query_id).adelete()
 
-        await sync_to_async(search_query.delete)()
-
-        return 200, {
-            "message": f"Đã xóa search query {search_query_id} thành công"
-        }
-
-    except SearchQuery.DoesNotExist:
+    if not deleted_count:
         return 404, {
             "error": "Not Found",
             "detail": f"Search query với ID {search_query_id} không tồn tại"
         }
+
+    return 200, {
+        "message": f"Đã xóa search query {search_query_id} thành công"
+    }
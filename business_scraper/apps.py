@@ -5,3 +5,6 @@ class BusinessScraperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'business_scraper'
     verbose_name = 'Business Scraper'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,126 @@
+"""
+Shared Chromium for the scrapers
+
+Playwright objects belong to the event loop that created them, while Django
+runs every async view on its own loop under WSGI. The browser therefore lives
+on one background loop thread for the whole process; scrapers submit their
+browser work to it with run_in_browser_loop() and get a warm browser from
+get_browser() instead of launching Chromium per request.
+"""
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
+from playwright.async_api import async_playwright, Browser, Playwright
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Chromium flags for the scrapers: stealth, plus switching off what a
+# headless text scrape never uses (GPU, extensions, background services,
+# crash reporting) to keep the browser's memory down
+LAUNCH_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--no-zygote',
+    '--disable-gpu',
+    '--disable-accelerated-2d-canvas',
+    '--disable-extensions',
+    '--disable-breakpad',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-features=TranslateUI,BlinkGenPropertyTrees',
+    '--mute-audio',
+)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# State below is only touched from the browser loop
+_playwright: Optional[Playwright] = None
+_browsers: Dict[Tuple, Browser] = {}
+_launch_lock: Optional[asyncio.Lock] = None
+
+
+def _browser_loop() -> asyncio.AbstractEventLoop:
+    """Start the background loop thread on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='playwright-loop', daemon=True).start()
+            atexit.register(_shutdown)
+            _loop = loop
+    return _loop
+
+
+async def run_in_browser_loop(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the browser loop and await its result from any loop
+
+    Args:
+        coro: Coroutine doing Playwright work
+
+    Returns:
+        The coroutine's result (exceptions are re-raised in the caller)
+    """
+    loop = _browser_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def get_browser(headless: bool = True, args: Tuple[str, ...] = ()) -> Browser:
+    """
+    Shared Chromium for the given launch options (call on the browser loop)
+
+    The browser is launched on first use and relaunched if it has crashed or
+    been disconnected.
+    """
+    global _playwright, _launch_lock
+    if _launch_lock is None:
+        _launch_lock = asyncio.Lock()
+
+    key = (headless, tuple(args))
+    async with _launch_lock:
+        browser = _browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+        logger.info(f"Launching shared Chromium (headless={headless})")
+        browser = _browsers[key] = await _playwright.chromium.launch(headless=headless, args=list(args))
+        return browser
+
+
+async def _close_all():
+    global _playwright
+    for browser in list(_browsers.values()):
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    _browsers.clear()
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+def _shutdown():
+    """Close the browsers and stop the loop on interpreter exit"""
+    if _loop is None or not _loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_all(), _loop).result(timeout=10)
+    except Exception as e:
+        logger.debug(f"Browser shutdown error: {e}")
+    _loop.call_soon_threadsafe(_loop.stop)
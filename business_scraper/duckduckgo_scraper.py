@@ -6,23 +6,281 @@ Searches DuckDuckGo and extracts business info from result websites
 import asyncio
 import logging
 import re
+import unicodedata
+from functools import lru_cache
 from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, Browser
-from urllib.parse import urlparse
-from .ai_services import GeminiService
+from playwright.async_api import Page, Browser, TimeoutError as PlaywrightTimeout
+from html.parser import HTMLParser
+from urllib.parse import urlparse, unquote
+from .ai_services import get_gemini_service, has_contact_details
+from .browser import LAUNCH_ARGS, get_browser, run_in_browser_loop
+from .html_text import MAX_PAGE_TEXT_CHARS as _MAX_PAGE_TEXT_CHARS, html_to_text_async
 
 logger = logging.getLogger(__name__)
 
+# Target of a DuckDuckGo redirect link (/y.js?...&uddg=<percent-encoded URL>)
+_UDDG_RE = re.compile(r'[?&]uddg=([^&#]+)')
+
+# One anchored match classifies a result link: DuckDuckGo link (a redirect
+# when /y.js? - JavaScript page - or /l/? - HTML endpoint - follows the host)
+# or direct http(s) link. Anything else ('#', 'javascript:', relative) fails
+_RESULT_URL_RE = re.compile(
+    r'(?P<ddg>(?:https?:)?//(?:[\w-]+\.)*duckduckgo\.com/(?P<redirect>(?:y\.js|l/)\?)?)'
+    r'|https?://'
+)
+
+# Browser context profile (desktop Chrome on Windows, US English)
+_CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'extra_http_headers': {
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    },
+}
+
+# Injected into every page of the context
+_STEALTH_JS = """
+    // Remove webdriver property
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // Override permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+
+    // Add chrome object
+    window.chrome = { runtime: {} };
+"""
+
+# Resource types never consulted by the text extraction (documents, scripts
+# and XHR/fetch still load - some sites inject contact details via XHR)
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Analytics/ads/chat widgets loaded by most small-business sites - never carry
+# page content, so their scripts and beacons are aborted too (matched on the
+# host and its parent domains; documents are never blocked by host)
+_BLOCKED_HOSTS = frozenset({
+    'google-analytics.com', 'googletagmanager.com', 'googlesyndication.com',
+    'doubleclick.net', 'googleadservices.com', 'facebook.net', 'hotjar.com',
+    'clarity.ms', 'analytics.tiktok.com', 'subiz.com', 'subiz.net', 'tawk.to',
+    'zopim.com', 'sp.zalo.me',
+})
+
+# Visible text of the page in one round-trip: body innerText, or - when that
+# is too short (e.g. content hidden by CSS) - the textContent of the document
+# without scripts/styles/navigation chrome. Text instead of raw HTML so the
+# Gemini prompt budget isn't spent on markup
+_PAGE_TEXT_JS = """(limit) => {
+    const text = document.body ? document.body.innerText : '';
+    if (text.length >= 200) return text.slice(0, limit);
+    const root = document.documentElement.cloneNode(true);
+    root.querySelectorAll('script, style, noscript, template, svg, nav, footer')
+        .forEach(el => el.remove());
+    return (root.textContent || '').slice(0, limit);
+}"""
+
+# All result articles read in one round-trip, using the exact selectors from
+# DuckDuckGo's HTML: title link a[data-testid="result-title-a"] (text in an
+# inner span) and snippet [data-result="snippet"] (text spans > 10 chars)
+_SEARCH_RESULTS_JS = """(limit) => Array.from(
+    document.querySelectorAll('article[data-testid="result"]')
+).slice(0, limit).map(article => {
+    const link = article.querySelector('a[data-testid="result-title-a"]');
+    if (!link) return null;
+    const titleElem = link.querySelector('span') || link;
+    const snippetElem = article.querySelector('[data-result="snippet"]');
+    let snippet = '';
+    if (snippetElem) {
+        const parts = Array.from(snippetElem.querySelectorAll('span'))
+            .map(span => span.innerText.trim())
+            .filter(text => text.length > 10);
+        snippet = parts.length ? parts.join(' ') : snippetElem.innerText.trim();
+    }
+    return {
+        url: link.getAttribute('href') || '',
+        title: titleElem.innerText.trim(),
+        snippet: snippet
+    };
+}).filter(Boolean)"""
+
+# Markers of a client-rendered app shell - such pages need the real browser
+_JS_SHELL_MARKERS = (b'id="__next"', b'id="root"', b'id="app"', b'id="__nuxt"')
+_CHARSET_RE = re.compile(r'charset=["\']?([\w-]+)', re.IGNORECASE)
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Rendered page text is cut to the same size as fast-path text inside the
+# browser, and bigger HTML documents go to the browser
+_MAX_FAST_FETCH_BYTES = 5 * 1024 * 1024
+
+# Contact details readable straight from a result's title/snippet: Vietnamese
+# phone numbers (+84/0 followed by 9-10 digits, usual separators) and emails
+_SNIPPET_PHONE_RE = re.compile(r'(?<![\d+])(?:\+84|0)(?:[\s.\-]?\d){8,10}(?!\d)')
+_SNIPPET_EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]*\w')
+# Listing pages ("Top 10 ...", "Danh sách ...") - a single phone in their
+# snippet belongs to one of many businesses, so they always get a full scrape
+_LISTING_TITLE_RE = re.compile(r'\btop\s*\d+|\bdanh sách\b|\b\d+\s*(?:địa chỉ|địa điểm|cửa hàng|quán)\b', re.IGNORECASE)
+# Site name suffix of a result title ("Hải Sản Tươi Sống - haisan.vn")
+_TITLE_SUFFIX_RE = re.compile(r'\s+[|\-–—]\s+.*$')
+
+
+# Server-rendered DuckDuckGo results (no JavaScript needed)
+_HTML_SEARCH_URL = 'https://html.duckduckgo.com/html/'
+
+
+class _HTMLResultsParser(HTMLParser):
+    """
+    Result links of the html.duckduckgo.com page: title link a.result__a and
+    snippet .result__snippet inside each div.result (ads - div.result--ad - skipped)
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.results: List[Dict] = []
+        self._in_ad = False
+        self._done = False  # set at the first result past the limit
+        self._field: Optional[str] = None  # 'title' / 'snippet' while inside one
+        self._field_tag: Optional[str] = None
+        self._parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+
+        if tag == 'div' and 'result' in classes:
+            # Stop at the next result, not at the last title: the last
+            # result's snippet comes after its title
+            if len(self.results) >= self.limit:
+                self._done = True
+                return
+            self._in_ad = 'result--ad' in classes
+        elif self._in_ad or self._field:
+            return
+        elif tag == 'a' and 'result__a' in classes:
+            self.results.append({'url': attrs.get('href') or '', 'title': '', 'snippet': ''})
+            self._start_field('title', tag)
+        elif 'result__snippet' in classes and self.results:
+            self._start_field('snippet', tag)
+
+    def handle_endtag(self, tag):
+        if self._field and tag == self._field_tag:
+            self.results[-1][self._field] = ' '.join(''.join(self._parts).split())
+            self._field = None
+
+    def handle_data(self, data):
+        if self._field:
+            self._parts.append(data)
+
+    def _start_field(self, field: str, tag: str):
+        self._field, self._field_tag, self._parts = field, tag, []
+
+
+@lru_cache(maxsize=4096)
+def _url_key(url: str) -> tuple:
+    """Dedup key of a result URL: host (without www.), path without trailing slash, query"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return (host, parsed.path.rstrip('/'), parsed.query)
+
+
+@lru_cache(maxsize=4096)
+def _is_blocked_host(url: str) -> bool:
+    """True if the URL's host or one of its parent domains is in _BLOCKED_HOSTS"""
+    labels = (urlparse(url).hostname or '').split('.')
+    return any('.'.join(labels[i:]) in _BLOCKED_HOSTS for i in range(len(labels) - 1))
+
+
+def _name_key(name: Optional[str]) -> Optional[str]:
+    """
+    Dedup key of a business name: NFKC-normalized (pages mix precomposed and
+    combining Vietnamese diacritics, full-width forms), casefolded, whitespace
+    collapsed. Short names (<= 10 chars) are too generic to dedup on and return None
+    """
+    name = (name or '').strip()
+    if len(name) <= 10:
+        return None
+    return ' '.join(unicodedata.normalize('NFKC', name).casefold().split())
+
+
+def _phone_key(phone: Optional[str]) -> Optional[str]:
+    """
+    Dedup key of a phone number: its last 9 digits, so "+84 912 345 678",
+    "0912.345.678" and "0912345678" compare equal (shorter hotlines such as
+    1900 xxxx keep all their digits). None without any digit
+    """
+    digits = _NON_DIGIT_RE.sub('', phone or '')
+    return digits[-9:] or None
+
+
+def _business_from_snippet(url: str, search_result: Dict) -> Optional[Dict]:
+    """
+    Business built from the search result alone, when its title/snippet
+    already shows a phone number (None otherwise)
+
+    Args:
+        url: Result website
+        search_result: Dict with 'title' and 'snippet' from the search page
+
+    Returns:
+        Business dict in the same shape as the Gemini extraction, or None
+    """
+    title = search_result.get('title') or ''
+    snippet = search_result.get('snippet') or ''
+    if _LISTING_TITLE_RE.search(title):
+        return None
+
+    meta_text = f"{title} {snippet}"
+    phone = _SNIPPET_PHONE_RE.search(meta_text)
+    if not phone:
+        return None
+
+    name = _TITLE_SUFFIX_RE.sub('', title).strip()
+    if not name or name == url:
+        return None
+
+    business = {
+        'name': name,
+        'phone': ' '.join(phone.group().split()),
+        'website': url,
+        'source': 'duckduckgo_snippet',
+    }
+    email = _SNIPPET_EMAIL_RE.search(meta_text)
+    if email:
+        business['email'] = email.group()
+    if snippet:
+        business['description'] = snippet
+    return business
+
 
 class DuckDuckGoScraper:
     """Scraper for DuckDuckGo search results"""
 
-    def __init__(self, headless: bool = True, timeout: int = 30000):
+    def __init__(self, headless: bool = True, timeout: int = 30000, concurrency: int = 8, site_timeout: float = 60):
         self.headless = headless
         self.timeout = timeout
+        self.concurrency = concurrency  # Max result websites open at once
+        self.site_timeout = site_timeout  # Seconds per result website (fetch/render + Gemini)
         self.browser = None
         self.context = None
-        self.ai_service = GeminiService()
+        self._page_pool: Optional[asyncio.Queue] = None  # Idle pages for result websites
+        self._context_lock: Optional[asyncio.Lock] = None
+        self.ai_service = get_gemini_service()
 
     async def scrape(self, keyword: str, location: str = "", max_results: int = 10) -> List[Dict]:
         """
@@ -39,96 +297,184 @@ class DuckDuckGoScraper:
         logger.info(f"=== DUCKDUCKGO SCRAPER ===")
         logger.info(f"Search: {keyword} {location}")
 
-        async with async_playwright() as p:
-            # Launch with stealth options
-            self.browser = await p.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='America/New_York',
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                }
-            )
-
-            # Add stealth scripts
-            await self.context.add_init_script("""
-                // Remove webdriver property
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-
-                // Override permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-
-                // Add chrome object
-                window.chrome = { runtime: {} };
-            """)
+        return await run_in_browser_loop(self._scrape(keyword, location, max_results))
 
-            try:
-                # Step 1: Get URLs from DuckDuckGo
-                urls = await self._search_duckduckgo(keyword, location, max_results)
-                logger.info(f"✓ Found {len(urls)} URLs from DuckDuckGo")
+    async def start(self):
+        """Open the browser context used by every scrape until close()"""
+        await run_in_browser_loop(self._ensure_context())
 
-                if not urls:
-                    logger.warning("No URLs found")
-                    return []
+    async def close(self):
+        """Close the browser context and its pages (the shared browser stays up)"""
+        await run_in_browser_loop(self._close_context())
+
+    async def __aenter__(self) -> 'DuckDuckGoScraper':
+        await self.start()
+        return self
 
-                # Step 2: Scrape each website for business info
-                businesses = await self._scrape_websites(urls, max_results)
-                logger.info(f"✓ Extracted {len(businesses)} businesses")
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_context(self):
+        """
+        Create the context on first use (or after the browser went away);
+        later scrapes - including concurrent ones - reuse it and its page pool
+        """
+        if self._context_lock is None:
+            self._context_lock = asyncio.Lock()
 
-                return businesses
+        async with self._context_lock:
+            if self.context is not None and self.browser.is_connected():
+                return
+            # Shared, already-running Chromium (launched with stealth options on first use)
+            self.browser = await get_browser(self.headless, LAUNCH_ARGS)
+            context = await self.browser.new_context(**_CONTEXT_OPTIONS)
 
+            try:
+                # Skip downloading images/media/fonts/CSS on every page
+                await context.route('**/*', self._block_heavy_resources)
+
+                # Add stealth scripts
+                await context.add_init_script(_STEALTH_JS)
+            except Exception:
+                await context.close()
+                raise
+
+            self.context = context
+            self._page_pool = asyncio.Queue()
+            logger.info("✓ Browser context ready")
+
+    async def _close_context(self):
+        context, self.context, self._page_pool = self.context, None, None
+        if context is not None:
+            try:
+                await context.close()
             except Exception as e:
-                logger.error(f"Scrape error: {str(e)}")
+                logger.debug(f"Context close error: {e}")
+
+    async def _scrape(self, keyword: str, location: str, max_results: int) -> List[Dict]:
+        """scrape() body - runs on the shared browser loop"""
+        try:
+            await self._ensure_context()
+
+            # Step 1: Get URLs from DuckDuckGo
+            urls = await self._search_duckduckgo(keyword, location, max_results)
+            logger.info(f"✓ Found {len(urls)} URLs from DuckDuckGo")
+
+            if not urls:
+                logger.warning("No URLs found")
                 return []
-            finally:
-                await self.browser.close()
+
+            # Step 2: Scrape each website for business info
+            businesses = await self._scrape_websites(urls, max_results)
+            logger.info(f"✓ Extracted {len(businesses)} businesses")
+
+            return businesses
+
+        except Exception as e:
+            logger.error(f"Scrape error: {str(e)}")
+            return []
+
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """Route handler: abort resource types and tracker hosts the scraper doesn't need"""
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in _BLOCKED_RESOURCE_TYPES or (resource_type != 'document' and _is_blocked_host(request.url)):
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def _search_duckduckgo(self, keyword: str, location: str, max_results: int) -> List[Dict]:
         """
         Search DuckDuckGo and extract result URLs
 
+        The server-rendered HTML endpoint is tried first (one HTTP request);
+        the JavaScript results page is only rendered when it returns nothing
+        (blocked, bot check, layout change).
+
         Returns:
             List of dicts with 'url', 'title', 'snippet'
         """
-        page = await self.context.new_page()
+        # Build search query
+        query = f"{keyword} {location}".strip()
+
+        try:
+            raw_results = await self._search_html_endpoint(query, max_results * 2)
+            if not raw_results:
+                raw_results = await self._search_rendered(query, max_results * 2)
+
+            if not raw_results:
+                logger.warning("No results found after all attempts")
+                return []
+
+            results = []
+            seen_urls = set()  # Same page listed twice (http/https, www., trailing /)
+            for raw in raw_results:
+                if len(results) >= max_results:
+                    break
+
+                url = self._resolve_result_url(raw['url'])
+
+                if url:
+                    url_key = _url_key(url)
+                    if url_key in seen_urls:
+                        logger.debug(f"  ⊗ Skipped duplicate URL: {url[:80]}")
+                        continue
+                    seen_urls.add(url_key)
+
+                    title = raw['title']
+                    results.append({
+                        'url': url,
+                        'title': title if title else url,
+                        'snippet': raw['snippet']
+                    })
+                    logger.info(f"  [{len(results)}] {title[:60]}")
+
+            return results
+
+        except Exception as e:
+            logger.error(f"DuckDuckGo search error: {str(e)}")
+            return []
+
+    async def _search_html_endpoint(self, query: str, limit: int) -> List[Dict]:
+        """Raw results of html.duckduckgo.com over plain HTTP ([] on any failure)"""
+        logger.info(f"URL: {_HTML_SEARCH_URL}?q={query}")
+        try:
+            response = await self.context.request.get(_HTML_SEARCH_URL, params={'q': query}, timeout=10000)
+        except Exception as e:
+            logger.warning(f"HTML search failed, rendering results page: {e}")
+            return []
+
+        try:
+            if not response.ok:
+                logger.warning(f"HTML search returned {response.status}, rendering results page")
+                return []
+            html = await response.text()
+        finally:
+            await response.dispose()
+
+        parser = _HTMLResultsParser(limit)
+        parser.feed(html)
+        parser.close()
+        logger.info(f"✓ Found {len(parser.results)} results (HTML endpoint)")
+        return parser.results
+
+    async def _search_rendered(self, query: str, limit: int) -> List[Dict]:
+        """Raw results of the JavaScript results page, rendered in the browser"""
+        page = await self._acquire_page()
 
         try:
-            # Build search query
-            query = f"{keyword} {location}".strip()
             search_url = f"https://duckduckgo.com/?q={query}&ia=web"
 
             logger.info(f"URL: {search_url}")
 
-            # Go to page and wait for load
+            # Go to page - the results are rendered client-side, so only the
+            # result selector below is waited on (not networkidle/load events)
             try:
-                await page.goto(search_url, wait_until='domcontentloaded', timeout=self.timeout)
-                # Wait for page to be stable after any redirects
-                await page.wait_for_load_state('networkidle', timeout=15000)
+                await page.goto(search_url, wait_until='commit', timeout=self.timeout)
             except Exception as nav_error:
                 logger.warning(f"Navigation warning: {nav_error}")
                 # Continue anyway, page might be loaded
-                await asyncio.sleep(5)
 
             # CRITICAL: Wait for search results to render
             # DuckDuckGo is SPA - need to wait for React to render results
@@ -136,154 +482,48 @@ class DuckDuckGoScraper:
 
             try:
                 # Wait for results container
-                await page.wait_for_selector('article[data-testid="result"]', timeout=15000)
+                await page.wait_for_selector('article[data-testid="result"]', state='attached', timeout=10000)
                 logger.info("✓ Results container found")
             except Exception as e:
                 logger.warning(f"Timeout waiting for results: {e}")
                 # Still try to continue
 
-            # Extra wait for all results to render
-            await asyncio.sleep(3)
-
             # Take screenshot for debugging
-            try:
-                await page.screenshot(path='duckduckgo_debug.png')
-                logger.info("Screenshot saved: duckduckgo_debug.png")
-            except:
-                pass
-
-            # Extra stabilization wait after screenshot
-            await asyncio.sleep(2)
-
-            # Extract search results using EXACT selectors from inspect
-            results = []
-
-            # CRITICAL FIX: Get HTML content first, THEN query
-            # This avoids timing issues with React rendering
-            try:
-                html_content = await page.content()
-                logger.info(f"Got page HTML: {len(html_content)} chars")
-            except Exception as e:
-                logger.error(f"Failed to get HTML: {e}")
-                return []
-
-            # Now query for elements (should be in DOM now)
-            result_elements = []
-            try:
-                # Re-query with fresh state
-                result_elements = await page.query_selector_all('article[data-testid="result"]')
-                logger.info(f"✓ Found {len(result_elements)} result articles")
-
-                if len(result_elements) == 0:
-                    # Fallback: Try li[data-layout="organic"]
-                    li_elements = await page.query_selector_all('li[data-layout="organic"]')
-                    logger.info(f"Fallback: Found {len(li_elements)} li[data-layout='organic']")
-
-                    if len(li_elements) > 0:
-                        # Query articles inside li elements
-                        for li in li_elements[:max_results * 2]:
-                            article = await li.query_selector('article[data-testid="result"]')
-                            if article:
-                                result_elements.append(article)
-                        logger.info(f"✓ Extracted {len(result_elements)} articles from li elements")
-
-            except Exception as e:
-                logger.error(f"Error querying results: {e}")
-                return []
-
-            if len(result_elements) == 0:
-                logger.warning("No results found after all attempts")
-                return []
-
-            for idx, article in enumerate(result_elements[:max_results * 2]):
-                if len(results) >= max_results:
-                    break
-
+            if logger.isEnabledFor(logging.DEBUG):
                 try:
-                    # Extract using EXACT selectors from USER's HTML
-                    # Title link: a[data-testid="result-title-a"]
-                    title_link = await article.query_selector('a[data-testid="result-title-a"]')
-                    if not title_link:
-                        logger.debug(f"Result {idx}: No title link found")
-                        continue
-
-                    # Get URL from title link
-                    url = await title_link.get_attribute('href')
-                    if not url:
-                        logger.debug(f"Result {idx}: No URL")
-                        continue
-
-                    # Get title text from span inside link
-                    title = ''
-                    try:
-                        title_span = await title_link.query_selector('span')
-                        if title_span:
-                            title = (await title_span.inner_text()).strip()
-                        else:
-                            title = (await title_link.inner_text()).strip()
-                    except:
-                        title = (await title_link.inner_text()).strip()
-
-                    # Get snippet/description with EXACT selector from USER's HTML
-                    snippet = ''
-                    try:
-                        # Exact: div[data-result="snippet"]
-                        snippet_container = await article.query_selector('[data-result="snippet"]')
-                        if snippet_container:
-                            # Get text from span inside
-                            snippet_spans = await snippet_container.query_selector_all('span')
-                            snippet_parts = []
-                            for span in snippet_spans:
-                                text = (await span.inner_text()).strip()
-                                if text and len(text) > 10:  # Skip short texts
-                                    snippet_parts.append(text)
-                            snippet = ' '.join(snippet_parts) if snippet_parts else (await snippet_container.inner_text()).strip()
-                    except Exception as e:
-                        logger.debug(f"Snippet extraction error: {e}")
-                        pass
-
-                    # Validate URL
-                    if not url or url.startswith('#') or url.startswith('javascript:'):
-                        continue
-
-                    # Handle DuckDuckGo redirect links
-                    if 'duckduckgo.com' in url:
-                        if '/y.js?' in url:
-                            # Extract real URL from redirect
-                            try:
-                                from urllib.parse import urlparse, parse_qs
-                                parsed = urlparse(url)
-                                query_params = parse_qs(parsed.query)
-                                if 'uddg' in query_params:
-                                    url = query_params['uddg'][0]
-                                else:
-                                    continue
-                            except:
-                                continue
-                        else:
-                            # Skip other DDG links
-                            continue
-
-                    # Must have valid URL
-                    if url and len(url) > 10 and url.startswith('http'):
-                        results.append({
-                            'url': url,
-                            'title': title if title else url,
-                            'snippet': snippet
-                        })
-                        logger.info(f"  [{len(results)}] {title[:60]}")
-
-                except Exception as e:
-                    logger.debug(f"Error extracting result {idx}: {e}")
-                    continue
-
-            return results
+                    await page.screenshot(path='duckduckgo_debug.png')
+                    logger.debug("Screenshot saved: duckduckgo_debug.png")
+                except Exception:
+                    pass
 
-        except Exception as e:
-            logger.error(f"DuckDuckGo search error: {str(e)}")
-            return []
+            # Extract search results using EXACT selectors from inspect
+            raw_results = await page.evaluate(_SEARCH_RESULTS_JS, limit)
+            logger.info(f"✓ Found {len(raw_results)} result articles")
+            return raw_results
         finally:
-            await page.close()
+            await self._release_page(page)
+
+    @staticmethod
+    def _resolve_result_url(url: str) -> Optional[str]:
+        """Real http(s) target of a result link (unwraps DuckDuckGo redirects), or None"""
+        match = _RESULT_URL_RE.match(url)
+        if not match:
+            return None
+
+        if match['ddg']:
+            # Skip DDG links other than result redirects
+            if not match['redirect']:
+                return None
+            # Extract real URL from redirect
+            uddg = _UDDG_RE.search(url, match.end() - 1)
+            if not uddg:
+                return None
+            url = unquote(uddg.group(1))
+            if not url.startswith('http'):
+                return None
+
+        # Must have valid URL
+        return url if len(url) > 10 else None
 
     async def _scrape_websites(self, url_data: List[Dict], max_results: int) -> List[Dict]:
         """
@@ -292,22 +532,41 @@ class DuckDuckGoScraper:
         with deduplication by phone number and business name
         """
         businesses = []
-        seen_phones = set()  # Track unique phone numbers
-        seen_names = set()   # Track unique business names (lowercase)
+        seen_phones = set()  # Track unique phone numbers (see _phone_key)
+        seen_names = set()   # Track unique business names (see _name_key)
+
+        # Websites are fetched concurrently in pages of the shared context;
+        # deduplication below runs over the results in search-rank order
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def scrape_one(idx: int, item: Dict) -> List[Dict]:
+            async with semaphore:
+                logger.info(f"[{idx+1}/{len(url_data)}] Scraping: {item['url'][:80]}")
+                # A hung site or Gemini call gives up its slot after site_timeout
+                try:
+                    return await asyncio.wait_for(
+                        self._extract_all_from_website(item['url'], item),
+                        timeout=self.site_timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"  ✗ Gave up after {self.site_timeout:g}s: {item['url'][:80]}")
+                    return []
 
-        for idx, item in enumerate(url_data):
+        results = await asyncio.gather(
+            *[scrape_one(idx, item) for idx, item in enumerate(url_data)],
+            return_exceptions=True
+        )
+
+        for item, extracted_businesses in zip(url_data, results):
             if len(businesses) >= max_results:
                 break
 
-            url = item['url']
-            logger.info(f"[{idx+1}/{len(url_data)}] Scraping: {url[:80]}")
-
             try:
-                # Extract ALL businesses from this website
-                extracted_businesses = await self._extract_all_from_website(url, item)
+                if isinstance(extracted_businesses, Exception):
+                    raise extracted_businesses
 
                 if extracted_businesses:
-                    logger.info(f"  ✓ Extracted {len(extracted_businesses)} business(es) from page")
+                    logger.info(f"  ✓ Extracted {len(extracted_businesses)} business(es) from {item['url'][:80]}")
 
                     # Add each business with deduplication
                     for business in extracted_businesses:
@@ -321,24 +580,25 @@ class DuckDuckGoScraper:
                             phone = phone[0] if phone else None
                             business['phone'] = phone
                             
-                        name = business.get('name', '').lower().strip()
+                        phone_key = _phone_key(phone)
+                        name_key = _name_key(business.get('name'))
 
                         # Skip if phone already seen
-                        if phone and phone in seen_phones:
+                        if phone_key and phone_key in seen_phones:
                             logger.debug(f"    ⊗ Skipped duplicate phone: {phone}")
                             continue
 
                         # Skip if business name already seen (avoid duplicates)
-                        if name and name in seen_names and len(name) > 10:
-                            logger.debug(f"    ⊗ Skipped duplicate name: {name[:50]}")
+                        if name_key and name_key in seen_names:
+                            logger.debug(f"    ⊗ Skipped duplicate name: {name_key[:50]}")
                             continue
 
                         # Add business
                         businesses.append(business)
-                        if phone:
-                            seen_phones.add(phone)
-                        if name and len(name) > 10:
-                            seen_names.add(name)
+                        if phone_key:
+                            seen_phones.add(phone_key)
+                        if name_key:
+                            seen_names.add(name_key)
 
                         logger.info(f"    ✓ Added: {business.get('name', 'Unknown')[:50]}")
 
@@ -352,37 +612,111 @@ class DuckDuckGoScraper:
         logger.info(f"Total unique businesses after deduplication: {len(businesses)}")
         return businesses
 
-    async def _extract_all_from_website(self, url: str, search_result: Dict) -> List[Dict]:
+    async def _fast_fetch_text(self, url: str) -> Optional[str]:
         """
-        Extract ALL businesses from a single website using Gemini AI
+        Fetch a page over plain HTTP (the context's request client - same
+        cookies and headers, no rendering) and return its text
+
+        Returns:
+            Page text, or None when the page needs a real browser render
+            (fetch failed, not HTML, too little text, or a JS app shell
+            without contact details)
         """
-        page = await self.context.new_page()
-        
         try:
-            # Go to website
-            await page.goto(url, wait_until='domcontentloaded', timeout=15000)
-            await asyncio.sleep(2)
+            response = await self.context.request.get(url, timeout=10000)
+        except Exception as e:
+            logger.debug(f"Fast fetch failed for {url[:80]}: {e}")
+            return None
+
+        try:
+            content_type = response.headers.get('content-type', '')
+            if not response.ok or 'html' not in content_type:
+                return None
+            if int(response.headers.get('content-length') or 0) > _MAX_FAST_FETCH_BYTES:
+                logger.warning(f"Page too large for fast fetch, rendering instead: {url[:80]}")
+                return None
+            body = (await response.body())[:_MAX_FAST_FETCH_BYTES]
+        finally:
+            await response.dispose()
+
+        if len(body) < 500:
+            return None
+
+        charset = _CHARSET_RE.search(content_type)
+        text = await html_to_text_async(body, charset.group(1) if charset else 'utf-8')
+        if len(text.strip()) < 200:
+            return None
+        if any(marker in body for marker in _JS_SHELL_MARKERS) and not has_contact_details(text):
+            return None
+        return text
+
+    async def _acquire_page(self) -> Page:
+        """Idle page from the pool, or a new one (bounded by the scrape semaphore)"""
+        try:
+            return self._page_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self.context.new_page()
+
+    async def _release_page(self, page: Page):
+        """Reset a page to about:blank and return it to the pool"""
+        try:
+            await page.goto('about:blank')
+        except Exception:
+            await page.close()
+            return
+        self._page_pool.put_nowait(page)
+
+    async def _render_page_text(self, url: str) -> str:
+        """Render the page in the browser and return its visible text"""
+        page = await self._acquire_page()
+
+        try:
+            # Go to website: return as soon as the response commits, then give
+            # the DOM a bounded time to parse (slow sites are read as-is)
+            await page.goto(url, wait_until='commit', timeout=15000)
+            try:
+                await page.wait_for_load_state('domcontentloaded', timeout=8000)
+            except PlaywrightTimeout:
+                logger.debug(f"DOM not ready after 8s, reading partial page: {url[:80]}")
 
             # Get page text content (better for LLM than raw HTML)
-            # We use evaluate to get innerText of body, which is cleaner
-            text_content = await page.evaluate("document.body.innerText")
-            
-            # If text is too short, try getting full HTML content but strip tags
-            if len(text_content) < 200:
-                 text_content = await page.content()
+            return await page.evaluate(_PAGE_TEXT_JS, _MAX_PAGE_TEXT_CHARS)
+        finally:
+            await self._release_page(page)
+
+    async def _extract_all_from_website(self, url: str, search_result: Dict) -> List[Dict]:
+        """
+        Extract ALL businesses from a single website using Gemini AI
+
+        Results whose search snippet already shows a phone number are taken
+        from the snippet without opening the site. Static pages are read over
+        plain HTTP; the browser is only used for pages that need JavaScript
+        to show their content.
+        """
+        snippet_business = _business_from_snippet(url, search_result)
+        if snippet_business:
+            logger.info(f"  ✓ Contact details in search snippet, skipping page load")
+            return [snippet_business]
+
+        try:
+            text_content = await self._fast_fetch_text(url)
+            if text_content is None:
+                text_content = await self._render_page_text(url)
 
             logger.info(f"  Sending {len(text_content)} chars to Gemini...")
 
             # Use Gemini to extract
             if self.ai_service.model:
-                businesses = self.ai_service.extract_multiple_businesses(text_content, url)
-                if businesses:
+                businesses = await self.ai_service.extract_multiple_businesses(text_content, url)
+                # [] = Gemini read the page and found nothing - asking again
+                # for a single business would only repeat that answer
+                if businesses is not None:
                     return businesses
             
-            # Fallback to single extraction if multiple failed or returned empty
-            # Or if we just want to try the single extraction method
+            # Fallback to single extraction when the page isn't a listing or
+            # the multiple extraction failed
             if self.ai_service.model:
-                 single_business = self.ai_service.extract_business_info(text_content, url)
+                 single_business = await self.ai_service.extract_business_info(text_content, url)
                  if single_business:
                      return [single_business]
 
@@ -391,18 +725,16 @@ class DuckDuckGoScraper:
         except Exception as e:
             logger.debug(f"Extract error for {url}: {str(e)}")
             return []
-        finally:
-            await page.close()
 
 
 async def test_duckduckgo_scraper():
     """Test function"""
-    scraper = DuckDuckGoScraper(headless=False)
-    results = await scraper.scrape(
-        keyword="cửa hàng hải sản",
-        location="hà nội",
-        max_results=5
-    )
+    async with DuckDuckGoScraper(headless=False) as scraper:
+        results = await scraper.scrape(
+            keyword="cửa hàng hải sản",
+            location="hà nội",
+            max_results=5
+        )
 
     print("\n" + "="*60)
     print(f"Found {len(results)} businesses")
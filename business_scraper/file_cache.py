@@ -0,0 +1,40 @@
+"""
+File cache cho dữ liệu scrape (Gemini, trang chi tiết HSCTVN)
+
+FileBasedCache của Django liệt kê toàn bộ thư mục cache ở mỗi lần set()
+để kiểm tra MAX_ENTRIES, còn entry hết hạn chỉ bị xóa khi được đọc lại.
+Backend này chỉ dọn mỗi CULL_EVERY lần ghi: xóa entry hết hạn trước, rồi
+mới cull ngẫu nhiên như Django nếu vẫn vượt MAX_ENTRIES.
+"""
+import itertools
+from collections import defaultdict
+from django.core.cache.backends.filebased import FileBasedCache
+
+DEFAULT_CULL_EVERY = 500
+
+# Số lần ghi theo thư mục cache, dùng chung giữa các instance (Django tạo
+# instance cache riêng cho từng thread/async context)
+_write_counters = defaultdict(lambda: itertools.count(1))
+
+
+class PeriodicCullFileBasedCache(FileBasedCache):
+    """FileBasedCache dọn thư mục mỗi CULL_EVERY lần ghi thay vì mỗi lần"""
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_every = int(params.get('OPTIONS', {}).get('CULL_EVERY', DEFAULT_CULL_EVERY))
+
+    def _cull(self):
+        if next(_write_counters[self._dir]) % self._cull_every:
+            return
+        self._delete_expired()
+        super()._cull()
+
+    def _delete_expired(self):
+        """Xóa các entry đã hết hạn (_is_expired tự xóa file hết hạn)"""
+        for fname in self._list_cache_files():
+            try:
+                with open(fname, 'rb') as f:
+                    self._is_expired(f)
+            except FileNotFoundError:
+                pass
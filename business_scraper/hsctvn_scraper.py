@@ -10,66 +10,235 @@ Features:
 """
 
 import asyncio
+import hashlib
 import re
 import logging
 from datetime import date, datetime
-from typing import List, Dict, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import urljoin
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from html.parser import HTMLParser
+from playwright.async_api import Page, Browser, BrowserContext
+from django.core.cache import caches
+from .browser import LAUNCH_ARGS, get_browser, run_in_browser_loop
+from .html_text import html_to_text_async
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compiled once - used for every list item / detail page
+# Total companies count - handle numbers with commas (1,021) or dots (1.021)
+_TOTAL_COUNT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in (
+        r'tìm thấy\s+<label>([\d,\.]+)</label>\s+hồ sơ',  # "tìm thấy <label>1,021</label> hồ sơ"
+        r'tìm thấy\s+([\d,\.]+)\s+hồ sơ\s+công ty',  # "tìm thấy 1,021 hồ sơ công ty"
+        r'tìm thấy\s+([\d,\.]+)\s+hồ sơ',  # "tìm thấy 1,021 hồ sơ"
+        r'([\d,\.]+)\s+hồ sơ\s+công ty',  # "1,021 hồ sơ công ty"
+        # In heading tag - gaps bounded so a miss can't rescan the rest of the page from every <h>
+        r'<h\d+[^>]*>.{0,300}?([\d,\.]+)\s+hồ sơ.{0,300}?</h\d+>',
+    )
+]
+# Literal shared by every count pattern - checked first so pages without it
+# skip the DOTALL/backtracking patterns entirely
+_TOTAL_COUNT_KEYWORD_RE = re.compile(r'hồ sơ', re.IGNORECASE)
+# Same count read inside the rendered page, from the body text
+_TOTAL_COUNT_JS = """() => {
+    const text = document.body ? document.body.innerText : '';
+    const match = text.match(/tìm thấy\\s+([\\d,.]+)\\s+hồ sơ/iu)
+        || text.match(/([\\d,.]+)\\s+hồ sơ\\s+công ty/iu);
+    return match ? match[1] : null;
+}"""
+# List page items, read in one round-trip. HTML structure:
+# <li>
+#   <h3><a href="...">COMPANY NAME</a></h3>
+#   <div>
+#     <em>Địa chỉ:</em> ADDRESS...
+#     <br>Mã số thuế: <a href="...">TAX_ID</a>
+#   </div>
+# </li>
+# (falls back to every <li> when none has an h3 > a; address and tax ID are
+# parsed from `text` by the regexes below)
+_LIST_ITEMS_JS = """(withFirstHtml) => {
+    let lis = Array.from(document.querySelectorAll('li:has(h3 > a)'));
+    if (!lis.length) lis = Array.from(document.querySelectorAll('li'));
+    const items = lis.map(li => {
+        const link = li.querySelector('h3 a');
+        const content = li.querySelector('p') || li.querySelector('div');
+        if (!link || !content) return null;
+        return {
+            name: link.innerText.trim(),
+            href: link.getAttribute('href'),
+            text: content.innerText
+        };
+    }).filter(Boolean);
+    return {items: items, first_html: withFirstHtml && lis.length ? lis[0].innerHTML : null};
+}"""
+_LIST_ADDRESS_RE = re.compile(r'Địa chỉ:\s*(.+?)(?:\n|Mã số thuế)', re.DOTALL)
+_LIST_TAX_ID_RE = re.compile(r'Mã số thuế:\s*(\d+)')
+# Detail page - all labelled fields in one pass; the group name is the field
+_DETAIL_FIELDS_RE = re.compile(
+    r'Điện thoại:\s*(?P<phone>[0-9\s\-\+]+)'
+    r'|Đại diện pháp luật:\s*(?P<legal_representative>[^\n]+)'
+    r'|Ngày cấp:\s*(?P<issue_date>\d{1,2}/\d{1,2}/\d{4})'
+    r'|Trạng thái:\s*(?P<status>[^\n]+)'
+    r'|Địa chỉ(?:\s+thuế)?:\s*(?P<address>[^\n]{20,300})',
+    re.IGNORECASE
+)
+_DETAIL_FIELD_COUNT = len(_DETAIL_FIELDS_RE.groupindex)
+# Detail page text: only the <ul> holding the labelled fields (the one with
+# the "Mã số thuế" item, if it also has the address) instead of the whole body
+_DETAIL_TEXT_JS = """() => {
+    const li = Array.from(document.querySelectorAll('li'))
+        .find(li => li.textContent.includes('Mã số thuế'));
+    const ul = li && li.closest('ul');
+    if (ul && ul.textContent.includes('Địa chỉ')) return ul.innerText;
+    return document.body ? document.body.innerText : '';
+}"""
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Resource types the text extraction never reads
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+
+class _ListItemsParser(HTMLParser):
+    """
+    Company items of a list page, read the same way as the browser path:
+    for every <li> with an <h3><a>, the link text and href and the text of
+    its first <p> (or, without one, its first <div>) with <br> as line breaks
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items: List[Dict] = []
+        self._open: List[Dict] = []  # <li> elements being read (nested lists)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'li':
+            self._open.append({
+                'name': [], 'href': None, 'p': None, 'div': None,
+                'h3': 0, 'in_a': False, 'in_p': False, 'div_depth': 0,
+            })
+            return
+        if not self._open:
+            return
+
+        item = self._open[-1]
+        if tag == 'h3':
+            item['h3'] += 1
+        elif tag == 'a' and item['h3'] and item['href'] is None:
+            item['href'] = dict(attrs).get('href') or ''
+            item['in_a'] = True
+        elif tag == 'p' and item['p'] is None:
+            item['p'] = []
+            item['in_p'] = True
+        elif tag == 'div':
+            if item['div'] is None:
+                item['div'] = []
+                item['div_depth'] = 1
+            elif item['div_depth']:
+                item['div_depth'] += 1
+                item['div'].append('\n')
+        elif tag == 'br':
+            self._append(item, '\n')
+
+    def handle_endtag(self, tag):
+        if not self._open:
+            return
+
+        item = self._open[-1]
+        if tag == 'li':
+            self._open.pop()
+            if item['href'] is not None:
+                text = item['p'] if item['p'] is not None else item['div']
+                self.items.append({
+                    'name': ' '.join(''.join(item['name']).split()),
+                    'href': item['href'],
+                    'text': '\n'.join(' '.join(line.split()) for line in ''.join(text or ()).split('\n')),
+                })
+        elif tag == 'h3':
+            item['h3'] = max(0, item['h3'] - 1)
+        elif tag == 'a':
+            item['in_a'] = False
+        elif tag == 'p':
+            item['in_p'] = False
+        elif tag == 'div' and item['div_depth']:
+            item['div_depth'] -= 1
+
+    def handle_data(self, data):
+        # Source line breaks are layout only (like innerText); <br> adds real ones
+        if self._open:
+            self._append(self._open[-1], _WHITESPACE_RE.sub(' ', data))
+
+    @staticmethod
+    def _append(item: Dict, text: str):
+        if item['in_a']:
+            item['name'].append(text)
+        if item['in_p']:
+            item['p'].append(text)
+        if item['div_depth']:
+            item['div'].append(text)
+
 
 class HSCTVNScraper:
     """
     Scraper for hsctvn.com - Vietnamese company registry
     """
 
-    def __init__(self, headless: bool = True, timeout: int = 30000):
+    def __init__(self, headless: bool = True, timeout: int = 30000, max_concurrency: int = 5, debug: bool = False):
         """
         Initialize scraper
 
         Args:
             headless: Run browser in headless mode
             timeout: Timeout in milliseconds
+            max_concurrency: Maximum number of detail pages loaded at once
+            debug: Write screenshot/HTML debug files (hsctvn_debug.png, ...)
         """
         self.headless = headless
         self.timeout = timeout
+        self.debug = debug
+        self.max_concurrency = max_concurrency
+        self._detail_semaphore: Optional[asyncio.Semaphore] = None
         self.base_url = "https://hsctvn.com"
-        self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self._setup_lock: Optional[asyncio.Lock] = None
+        # Scrapes currently using the context (the last one closes it)
+        self._context_users = 0
 
     async def __aenter__(self):
-        """Async context manager entry"""
-        await self._setup_browser()
+        """Async context manager entry (the context stays open until exit)"""
+        await run_in_browser_loop(self._acquire_context())
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        await self.close()
+        await run_in_browser_loop(self._release_context())
 
     async def _setup_browser(self):
-        """Setup Playwright browser with stealth mode"""
+        """
+        Open a browser context with stealth mode on the shared Chromium (call
+        on the browser loop); concurrent callers wait for and reuse the same
+        context instead of each creating one
+        """
+        if self._setup_lock is None:
+            self._setup_lock = asyncio.Lock()
+
+        async with self._setup_lock:
+            if self.context is not None and self.browser.is_connected():
+                return
+            # Drop the old context if the browser went away
+            if self.context is not None:
+                logger.info("Browser disconnected, cleaning up and reinitializing...")
+                await self._close_context()
+            await self._open_context()
+
+    async def _open_context(self):
         try:
-            logger.info("Starting Playwright browser setup...")
-
-            # Start Playwright and store the instance
-            self.playwright = await async_playwright().start()
-            logger.info("Playwright started successfully")
-
-            # Launch browser
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
-            logger.info("Browser launched successfully")
+            # Shared, already-running Chromium (launched on first use)
+            self.browser = await get_browser(self.headless, LAUNCH_ARGS)
 
             # Create browser context
             self.context = await self.browser.new_context(
@@ -78,6 +247,9 @@ class HSCTVNScraper:
             )
             logger.info("Browser context created successfully")
 
+            # Skip downloading images/media/fonts/CSS on every page
+            await self.context.route('**/*', self._block_heavy_resources)
+
             # Remove webdriver detection
             await self.context.add_init_script("""
                 Object.defineProperty(navigator, 'webdriver', {
@@ -85,37 +257,62 @@ class HSCTVNScraper:
                 });
             """)
 
+            # Bounds the detail pages open at once across all list pages
+            # (and all scrapes sharing this context)
+            self._detail_semaphore = asyncio.Semaphore(self.max_concurrency)
+
             logger.info("Browser setup complete - Ready to scrape")
 
         except Exception as e:
             logger.error(f"Failed to setup browser: {str(e)}")
             # Clean up any partial initialization
-            if self.context:
-                await self.context.close()
-                self.context = None
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
+            await self._close_context()
             raise RuntimeError(f"Browser setup failed: {str(e)}") from e
 
+    @asynccontextmanager
+    async def _page(self) -> AsyncIterator[Page]:
+        """New tab in the scraper's context, closed on exit (errors and cancellation included)"""
+        page = await self.context.new_page()
+        try:
+            yield page
+        finally:
+            await page.close()
+
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """Route handler: abort resource types the scraper doesn't need"""
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def close(self):
-        """Close browser and cleanup resources"""
+        """Close the browser context and its pages (the shared browser stays up)"""
+        await run_in_browser_loop(self._close_context())
+
+    async def _acquire_context(self):
+        """Register as a context user and open the context if needed"""
+        self._context_users += 1
         try:
-            if self.context:
-                await self.context.close()
-                self.context = None
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
-            logger.info("Browser closed and resources cleaned up")
-        except Exception as e:
-            logger.error(f"Error during cleanup: {str(e)}")
+            await self._setup_browser()
+        except BaseException:
+            await self._release_context()
+            raise
+
+    async def _release_context(self):
+        """Close the context once no scrape is using it any more"""
+        self._context_users -= 1
+        if self._context_users == 0:
+            await self._close_context()
+
+    async def _close_context(self):
+        context, self.context = self.context, None
+        if context is not None:
+            try:
+                await context.close()
+                logger.info("Browser context closed")
+            except Exception as e:
+                logger.error(f"Error during cleanup: {str(e)}")
 
     async def scrape(
         self,
@@ -134,6 +331,60 @@ class HSCTVNScraper:
         Returns:
             List of company data dicts
         """
+        return await run_in_browser_loop(self._scrape(scrape_date, max_results, max_pages))
+
+    async def _scrape(self, scrape_date: Optional[date], max_results: int, max_pages: Optional[int]) -> List[Dict]:
+        """scrape() body - runs on the shared browser loop"""
+        return [company async for company in self._iter_scrape(scrape_date, max_results, max_pages)]
+
+    async def iter_scrape(
+        self,
+        scrape_date: date = None,
+        max_results: int = 100,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Scrape companies from hsctvn.com for a specific date, yielding them as
+        each list page (with its detail pages) completes, so callers can save
+        and drop them instead of holding the whole scrape in memory
+
+        Pages after the first finish in any order; stopping iteration early
+        cancels the pages still running. Close the generator (aclose() or
+        contextlib.aclosing) when not consuming it to the end, so the browser
+        is released promptly.
+
+        Args:
+            scrape_date: Date to scrape (default: today)
+            max_results: Maximum number of companies to yield
+            max_pages: Maximum number of pages to scrape (None = all pages)
+
+        Yields:
+            Company data dicts
+        """
+        # The generator itself runs on the shared browser loop; each step is
+        # submitted there from the caller's loop
+        companies = self._iter_scrape(scrape_date, max_results, max_pages)
+        done = object()
+
+        async def next_company():
+            try:
+                return await companies.__anext__()
+            except StopAsyncIteration:
+                return done
+
+        try:
+            while (company := await run_in_browser_loop(next_company())) is not done:
+                yield company
+        finally:
+            await run_in_browser_loop(companies.aclose())
+
+    async def _iter_scrape(
+        self,
+        scrape_date: Optional[date],
+        max_results: int,
+        max_pages: Optional[int]
+    ) -> AsyncIterator[Dict]:
+        """iter_scrape() body - runs on the shared browser loop"""
         if not scrape_date:
             scrape_date = date.today()
 
@@ -148,96 +399,158 @@ class HSCTVNScraper:
         logger.info(f"Max results: {max_results}")
         logger.info("="*60)
 
-        # Setup browser if not already done or if browser is disconnected
-        if not self.browser or not self.browser.is_connected():
-            # Close old browser if exists but disconnected
-            if self.browser:
-                logger.info("Browser disconnected, cleaning up and reinitializing...")
-                await self.close()
-            await self._setup_browser()
-
-        # Validate browser and context are ready
-        if not self.browser or not self.context:
-            raise RuntimeError("Browser initialization failed - browser or context is None")
-
         # Build URL
         url = f"{self.base_url}/ngay-{day}/{month}/{year}"
         logger.info(f"URL: {url}")
 
-        # Get first page to determine total companies and pages
-        page = await self.context.new_page()
-        companies = []
+        yielded = 0
+        self._context_users += 1
 
         try:
-            await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
-            await asyncio.sleep(2)  # Wait for content to render
-
-            # Wait for company list to appear
-            try:
-                await page.wait_for_selector('li:has(h3 > a)', timeout=10000)
-            except Exception:
-                logger.warning("Could not find company list selector")
-
-            # Take screenshot for debugging
-            await page.screenshot(path='hsctvn_debug.png')
-            logger.info("Screenshot saved: hsctvn_debug.png")
-
-            # Get total companies count
-            total_companies = await self._get_total_companies(page)
-            logger.info(f"Total companies on {day}/{month}/{year}: {total_companies}")
-
-            if total_companies == 0:
-                logger.warning("No companies found for this date")
-                return []
-
-            # Calculate total pages (assuming ~12 companies per page based on 784/66)
-            companies_per_page = 12
-            total_pages = (total_companies + companies_per_page - 1) // companies_per_page
-
-            if max_pages:
-                total_pages = min(total_pages, max_pages)
-
-            # Calculate pages needed to reach max_results
-            pages_needed = min(total_pages, (max_results + companies_per_page - 1) // companies_per_page)
-
-            logger.info(f"Total pages: {total_pages}")
-            logger.info(f"Will scrape: {pages_needed} pages")
-
-            # Scrape first page
-            page_companies = await self._scrape_page(page)
-            companies.extend(page_companies)
-            logger.info(f"[Page 1/{pages_needed}] Extracted {len(page_companies)} companies")
-
-            # Scrape remaining pages
-            for page_num in range(2, pages_needed + 1):
-                if len(companies) >= max_results:
-                    break
-
-                page_url = f"{url}/page-{page_num}"
-                await page.goto(page_url, wait_until='domcontentloaded', timeout=self.timeout)
-                await asyncio.sleep(0.5)
-
-                page_companies = await self._scrape_page(page)
-                companies.extend(page_companies)
-                logger.info(f"[Page {page_num}/{pages_needed}] Extracted {len(page_companies)} companies")
-
-            # Trim to max_results
-            companies = companies[:max_results]
-
-            logger.info("="*60)
-            logger.info(f"✓ Scraped {len(companies)} companies from {pages_needed} pages")
-            logger.info("="*60)
+            # Setup browser context if not already done or if browser is disconnected
+            await self._setup_browser()
 
-            return companies
+            # Validate browser and context are ready
+            if not self.browser or not self.context:
+                raise RuntimeError("Browser initialization failed - browser or context is None")
+
+            # Get first page to determine total companies and pages
+            async with self._page() as page:
+                # List pages are server-rendered: read them over plain HTTP and
+                # only render in the browser when that fails
+                html = await self._fetch_html(url)
+                first_page = self._parse_list_html(html) if html else []
+                total_companies = self._count_from_html(html.decode('utf-8', 'replace')) if first_page else 0
+
+                if not total_companies:
+                    first_page = None
+                    await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
+
+                    # Wait for company list to appear
+                    try:
+                        await page.wait_for_selector('li:has(h3 > a)', state='attached', timeout=10000)
+                    except Exception:
+                        logger.warning("Could not find company list selector")
+
+                    # Take screenshot for debugging
+                    if self.debug:
+                        await page.screenshot(path='hsctvn_debug.png')
+                        logger.info("Screenshot saved: hsctvn_debug.png")
+
+                    # Get total companies count
+                    total_companies = await self._get_total_companies(page)
+                logger.info(f"Total companies on {day}/{month}/{year}: {total_companies}")
+
+                if total_companies == 0:
+                    logger.warning("No companies found for this date")
+                    return
+
+                # Calculate total pages (assuming ~12 companies per page based on 784/66)
+                companies_per_page = 12
+                total_pages = (total_companies + companies_per_page - 1) // companies_per_page
+
+                if max_pages:
+                    total_pages = min(total_pages, max_pages)
+
+                # Calculate pages needed to reach max_results
+                pages_needed = min(total_pages, (max_results + companies_per_page - 1) // companies_per_page)
+
+                logger.info(f"Total pages: {total_pages}")
+                logger.info(f"Will scrape: {pages_needed} pages")
+
+                # Scrape first page
+                if first_page is None:
+                    page_companies = await self._scrape_page(page)
+                else:
+                    page_companies = await self._add_details(first_page)
+                logger.info(f"[Page 1/{pages_needed}] Extracted {len(page_companies)} companies")
+                for company in page_companies[:max_results]:
+                    yielded += 1
+                    yield company
+
+                # Scrape remaining pages concurrently, in up to max_concurrency tabs
+                # (reused through a queue); results are yielded as pages complete
+                tabs = asyncio.Queue()
+                tabs.put_nowait(page)
+                list_semaphore = asyncio.Semaphore(self.max_concurrency)
+                collected = len(page_companies)
+
+                async def scrape_list_page(page_num: int) -> List[Dict]:
+                    nonlocal collected
+                    async with list_semaphore:
+                        if collected >= max_results:
+                            return []
+
+                        page_url = f"{url}/page-{page_num}"
+                        html = await self._fetch_html(page_url)
+                        page_companies = self._parse_list_html(html) if html else []
+
+                        if page_companies:
+                            await self._add_details(page_companies)
+                        else:
+                            try:
+                                tab = tabs.get_nowait()
+                            except asyncio.QueueEmpty:
+                                tab = await self.context.new_page()
+
+                            try:
+                                await tab.goto(page_url, wait_until='domcontentloaded', timeout=self.timeout)
+                                try:
+                                    await tab.wait_for_selector('li:has(h3 > a)', state='attached', timeout=10000)
+                                except Exception:
+                                    logger.warning(f"Could not find company list selector on page {page_num}")
+
+                                page_companies = await self._scrape_page(tab)
+                            finally:
+                                tabs.put_nowait(tab)
+
+                        collected += len(page_companies)
+                        logger.info(f"[Page {page_num}/{pages_needed}] Extracted {len(page_companies)} companies")
+                        return page_companies
+
+                async def scrape_list_page_safe(page_num: int) -> List[Dict]:
+                    try:
+                        return await scrape_list_page(page_num)
+                    except Exception as e:
+                        logger.error(f"[Page {page_num}/{pages_needed}] Error: {str(e)}")
+                        return []
+
+                tasks = [
+                    asyncio.create_task(scrape_list_page_safe(page_num))
+                    for page_num in range(2, pages_needed + 1)
+                ]
+                try:
+                    for next_page in asyncio.as_completed(tasks):
+                        if yielded >= max_results:
+                            break
+                        for company in (await next_page)[:max_results - yielded]:
+                            yielded += 1
+                            yield company
+                finally:
+                    # Pages still running when iteration stopped early
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+                    # Extra list tabs; `page` itself is closed by _page(). The
+                    # context outlives this scrape while others still use it
+                    while not tabs.empty():
+                        tab = tabs.get_nowait()
+                        if tab is not page:
+                            await tab.close()
+
+                logger.info("="*60)
+                logger.info(f"✓ Scraped {yielded} companies from {pages_needed} pages")
+                logger.info("="*60)
 
         except Exception as e:
             logger.error(f"Scraping error: {str(e)}")
             raise
         finally:
-            await page.close()
-            # Close browser after scraping to prevent connection issues on next request
-            logger.info("Cleaning up browser resources after scraping...")
-            await self.close()
+            # Close the context (and tabs) unless another scrape still uses
+            # it; the shared browser stays up
+            logger.info("Cleaning up browser context after scraping...")
+            await self._release_context()
 
     async def _get_total_companies(self, page: Page) -> int:
         """
@@ -251,53 +564,96 @@ class HSCTVNScraper:
         """
         try:
             # Look for heading like "tìm thấy 784 hồ sơ công ty | trang 1"
-            # or "tìm thấy <label>1,021</label> hồ sơ công ty | trang 1"
-            content = await page.content()
-
-            # Log content for debugging
-            logger.debug(f"Page content length: {len(content)} chars")
-
-            # Try multiple patterns - handle numbers with commas (1,021) or dots (1.021)
-            patterns = [
-                r'tìm thấy\s+<label>([\d,\.]+)</label>\s+hồ sơ',  # "tìm thấy <label>1,021</label> hồ sơ"
-                r'tìm thấy\s+([\d,\.]+)\s+hồ sơ\s+công ty',  # "tìm thấy 1,021 hồ sơ công ty"
-                r'tìm thấy\s+([\d,\.]+)\s+hồ sơ',  # "tìm thấy 1,021 hồ sơ"
-                r'([\d,\.]+)\s+hồ sơ\s+công ty',  # "1,021 hồ sơ công ty"
-                r'<h\d+[^>]*>.*?([\d,\.]+)\s+hồ sơ.*?</h\d+>',  # In heading tag
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-                if match:
-                    # Extract number and remove commas/dots
-                    number_str = match.group(1).replace(',', '').replace('.', '')
-                    count = int(number_str)
-                    logger.info(f"Found company count: {count} (original: {match.group(1)})")
-                    return count
-
-            # If regex fails, try to find via text content
-            try:
-                text_content = await page.inner_text('body')
-                match = re.search(r'tìm thấy\s+([\d,\.]+)\s+hồ sơ', text_content, re.IGNORECASE)
-                if match:
-                    number_str = match.group(1).replace(',', '').replace('.', '')
-                    count = int(number_str)
-                    logger.info(f"Found company count in page text: {count}")
-                    return count
-            except Exception:
-                pass
+            # (innerText - the <label> around the number is already gone);
+            # only the matched number crosses over from the page
+            number_str = await page.evaluate(_TOTAL_COUNT_JS)
+            if number_str:
+                count = int(number_str.replace(',', '').replace('.', ''))
+                logger.info(f"Found company count in page text: {count} (original: {number_str})")
+                return count
 
             logger.warning("Could not find total companies count")
             # Save content to file for debugging
-            with open('hsctvn_debug_content.html', 'w', encoding='utf-8') as f:
-                f.write(content)
-            logger.info("Saved page content to hsctvn_debug_content.html for debugging")
+            if self.debug:
+                with open('hsctvn_debug_content.html', 'w', encoding='utf-8') as f:
+                    f.write(await page.content())
+                logger.info("Saved page content to hsctvn_debug_content.html for debugging")
             return 0
 
         except Exception as e:
             logger.error(f"Error getting total companies: {str(e)}")
             return 0
 
+    @staticmethod
+    def _count_from_html(content: str) -> int:
+        """
+        Total number of companies from the heading in the page HTML
+
+        Args:
+            content: Page HTML
+
+        Returns:
+            Total number of companies (0 if not found)
+        """
+        # Log content for debugging
+        logger.debug(f"Page content length: {len(content)} chars")
+
+        # Try multiple patterns
+        patterns = _TOTAL_COUNT_PATTERNS if _TOTAL_COUNT_KEYWORD_RE.search(content) else ()
+        for pattern in patterns:
+            match = pattern.search(content)
+            if match:
+                # Extract number and remove commas/dots
+                number_str = match.group(1).replace(',', '').replace('.', '')
+                count = int(number_str)
+                logger.info(f"Found company count: {count} (original: {match.group(1)})")
+                return count
+        return 0
+
+    async def _fetch_html(self, url: str) -> Optional[bytes]:
+        """
+        Fetch a page over plain HTTP with the context's request client (same
+        cookies and user agent, no rendering)
+
+        Returns:
+            HTML body, or None when the page has to be rendered instead
+        """
+        try:
+            response = await self.context.request.get(url, timeout=self.timeout)
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url[:80]}: {e}")
+            return None
+
+        try:
+            if not response.ok or 'html' not in response.headers.get('content-type', ''):
+                logger.debug(f"HTTP fetch returned {response.status} for {url[:80]}")
+                return None
+            return await response.body()
+        finally:
+            await response.dispose()
+
+    def _parse_list_html(self, html: bytes) -> List[Dict]:
+        """
+        Companies (list-level fields) from the HTML of a list page
+
+        Args:
+            html: List page HTML
+
+        Returns:
+            List of company data dicts (without detail page fields)
+        """
+        parser = _ListItemsParser()
+        parser.feed(html.decode('utf-8', 'replace'))
+        parser.close()
+
+        companies = []
+        for item in parser.items:
+            company_data = self._build_company(item['name'], item['href'], item['text'])
+            if company_data:
+                companies.append(company_data)
+        logger.debug(f"Parsed {len(companies)} companies from {len(parser.items)} list items")
+        return companies
+
     async def _scrape_page(self, page: Page) -> List[Dict]:
         """
         Scrape companies from a single page
@@ -311,123 +667,97 @@ class HSCTVNScraper:
         companies = []
 
         try:
-            # Find all <li> elements containing company data
-            li_elements = await page.query_selector_all('li:has(h3 > a)')
-            logger.debug(f"Found {len(li_elements)} li elements with h3>a")
-
-            # If no elements found, try simpler selector
-            if len(li_elements) == 0:
-                li_elements = await page.query_selector_all('li')
-                logger.debug(f"Found {len(li_elements)} li elements (all)")
+            # All <li> elements containing company data in one round-trip
+            result = await page.evaluate(_LIST_ITEMS_JS, self.debug)
+            items = result['items']
+            logger.debug(f"Found {len(items)} li elements with h3>a")
 
             # Debug: Save first li element HTML
-            if len(li_elements) > 0:
-                first_li_html = await li_elements[0].inner_html()
+            if self.debug and result['first_html'] is not None:
                 with open('hsctvn_first_li.html', 'w', encoding='utf-8') as f:
-                    f.write(first_li_html)
+                    f.write(result['first_html'])
                 logger.info("Saved first li element HTML to hsctvn_first_li.html")
 
-            for idx, li in enumerate(li_elements, 1):
-                try:
-                    company_data = await self._extract_company_from_li(li)
-                    if company_data:
-                        companies.append(company_data)
-                        logger.debug(f"  [{idx}] ✓ Extracted: {company_data.get('name', '')[:50]}")
-                    else:
-                        logger.debug(f"  [{idx}] ✗ No data extracted")
-                except Exception as e:
-                    logger.debug(f"  [{idx}] ✗ Error extracting company: {str(e)}")
-                    continue
+            for idx, item in enumerate(items, 1):
+                company_data = self._build_company(item['name'], item['href'], item['text'])
+                if company_data:
+                    companies.append(company_data)
+                    logger.debug(f"  [{idx}] ✓ Extracted: {company_data.get('name', '')[:50]}")
+                else:
+                    logger.debug(f"  [{idx}] ✗ No data extracted")
+
+            await self._add_details(companies)
 
         except Exception as e:
             logger.error(f"Error scraping page: {str(e)}")
 
         return companies
 
-    async def _extract_company_from_li(self, li_element) -> Optional[Dict]:
+    async def _add_details(self, companies: List[Dict]) -> List[Dict]:
         """
-        Extract company data from <li> element
-
-        HTML structure:
-        <li>
-          <h3><a href="...">COMPANY NAME</a></h3>
-          <div>
-            <em>Địa chỉ:</em> ADDRESS...
-            <br>Mã số thuế: <a href="...">TAX_ID</a>
-          </div>
-        </li>
+        Add detail page fields to the companies of one list page; detail
+        pages are loaded concurrently (bounded by max_concurrency)
 
         Args:
-            li_element: Playwright element
+            companies: Company data dicts from a list page (updated in place)
 
         Returns:
-            Dict with company data or None
+            The same list
         """
-        try:
-            # Extract company name from <h3><a>
-            name_elem = await li_element.query_selector('h3 a')
-            if not name_elem:
-                logger.debug("No h3 > a found in li element")
-                return None
-
-            name = (await name_elem.inner_text()).strip()
-            company_url = await name_elem.get_attribute('href')
-
-            if not name:
-                logger.debug("Empty company name")
-                return None
-
-            # Extract from <p> or <div> element
-            content_elem = await li_element.query_selector('p')
-            if not content_elem:
-                content_elem = await li_element.query_selector('div')
-
-            if not content_elem:
-                logger.debug(f"No <p> or <div> element found for: {name[:30]}")
-                return None
-
-            content_text = await content_elem.inner_text()
-            logger.debug(f"Content text for {name[:30]}: {content_text[:100]}")
+        with_detail = [company for company in companies if company['website']]
+        details = await asyncio.gather(
+            *[self._scrape_detail_page(company['website']) for company in with_detail],
+            return_exceptions=True
+        )
+        for company, detail_data in zip(with_detail, details):
+            if isinstance(detail_data, dict):
+                company.update(detail_data)
+        return companies
 
-            # Extract address (after "Địa chỉ:")
-            address = None
-            address_match = re.search(r'Địa chỉ:\s*(.+?)(?:\n|Mã số thuế)', content_text, re.DOTALL)
-            if address_match:
-                address = address_match.group(1).strip()
+    def _build_company(self, name: str, company_url: Optional[str], content_text: str) -> Optional[Dict]:
+        """
+        Company data from the fields of one list item
 
-            # Extract tax ID (after "Mã số thuế:")
-            tax_id = None
-            tax_id_match = re.search(r'Mã số thuế:\s*(\d+)', content_text)
-            if tax_id_match:
-                tax_id = tax_id_match.group(1).strip()
+        Args:
+            name: Company name (link text)
+            company_url: Detail page link (may be relative)
+            content_text: Text of the item's <p>/<div> with address and tax ID
 
-            # Validate required fields
-            if not name or not tax_id:
-                logger.debug(f"Missing required field - name: {bool(name)}, tax_id: {bool(tax_id)}")
-                return None
+        Returns:
+            Dict with company data or None if a required field is missing
+        """
+        if not name:
+            logger.debug("Empty company name")
+            return None
 
-            # Build basic company data
-            company_data = {
-                'name': name,
-                'tax_id': tax_id,
-                'address': address,
-                'website': urljoin(self.base_url, company_url) if company_url else None,
-                'source': 'hsctvn'
-            }
+        logger.debug(f"Content text for {name[:30]}: {content_text[:100]}")
 
-            # Navigate to detail page to get more info
-            if company_url:
-                detail_url = urljoin(self.base_url, company_url)
-                detail_data = await self._scrape_detail_page(detail_url)
-                if detail_data:
-                    company_data.update(detail_data)
+        # Extract address (after "Địa chỉ:")
+        address = None
+        address_match = _LIST_ADDRESS_RE.search(content_text)
+        if address_match:
+            address = address_match.group(1).strip()
 
-            return company_data
+        # Extract tax ID (after "Mã số thuế:")
+        tax_id = None
+        tax_id_match = _LIST_TAX_ID_RE.search(content_text)
+        if tax_id_match:
+            tax_id = tax_id_match.group(1).strip()
 
-        except Exception as e:
-            logger.debug(f"Error extracting company data: {str(e)}")
+        # Validate required fields
+        if not name or not tax_id:
+            logger.debug(f"Missing required field - name: {bool(name)}, tax_id: {bool(tax_id)}")
             return None
 
+        # Build basic company data
+        return {
+            'name': name,
+            'tax_id': tax_id,
+            'address': address,
+            'website': urljoin(self.base_url, company_url) if company_url else None,
+            'source': 'hsctvn'
+        }
+
     async def _scrape_detail_page(self, detail_url: str) -> Optional[Dict]:
         """
         Navigate to detail page and extract additional information
@@ -445,73 +775,114 @@ class HSCTVNScraper:
         Returns:
             Dict with additional company data or None
         """
+        # Detail fields seen in an earlier scrape (same company URL) are reused
+        key = 'hsctvn:detail:' + hashlib.md5(detail_url.encode()).hexdigest()
+        try:
+            detail_data = await caches['hsctvn'].aget(key)
+        except Exception as e:
+            logger.debug(f"  Detail cache read error: {e}")
+            detail_data = None
+        if detail_data is not None:
+            return detail_data
+
+        async with self._detail_semaphore:
+            detail_data = await self._load_detail_page(detail_url)
+
+        if detail_data:
+            try:
+                await caches['hsctvn'].aset(key, detail_data)
+            except Exception as e:
+                logger.debug(f"  Detail cache write error: {e}")
+        return detail_data
+
+    async def _load_detail_page(self, detail_url: str) -> Optional[Dict]:
+        """_scrape_detail_page body - runs while holding a detail page slot"""
+        # Detail pages are server-rendered too: plain HTTP first
+        body = await self._fetch_html(detail_url)
+        if body is not None:
+            detail_data = self._parse_detail_text(await html_to_text_async(body))
+            if detail_data:
+                return detail_data
+
         # Validate context before creating page
         if not self.context:
             logger.error("Browser context is None - cannot create new page")
             return None
 
-        page = await self.context.new_page()
-
         try:
-            logger.debug(f"  Fetching detail page: {detail_url[:60]}...")
-            await page.goto(detail_url, wait_until='domcontentloaded', timeout=self.timeout)
-            await asyncio.sleep(0.5)
-
-            # Get page text content
-            body_text = await page.inner_text('body')
-
-            # Extract fields from <li> elements
-            detail_data = {}
-
-            # Phone (Điện thoại)
-            phone_match = re.search(r'Điện thoại:\s*([0-9\s\-\+]+)', body_text, re.IGNORECASE)
-            if phone_match:
-                phone = phone_match.group(1).strip()
-                detail_data['phone'] = re.sub(r'\s+', '', phone)  # Remove spaces
-
-            # Legal representative (Đại diện pháp luật)
-            legal_rep_match = re.search(r'Đại diện pháp luật:\s*([^\n]+)', body_text, re.IGNORECASE)
-            if legal_rep_match:
-                detail_data['legal_representative'] = legal_rep_match.group(1).strip()
-
-            # Issue date (Ngày cấp) - format: 21/10/2025
-            issue_date_match = re.search(r'Ngày cấp:\s*(\d{1,2}/\d{1,2}/\d{4})', body_text, re.IGNORECASE)
-            if issue_date_match:
-                date_str = issue_date_match.group(1).strip()
-                # Parse date
+            async with self._page() as page:
+                logger.debug(f"  Fetching detail page: {detail_url[:60]}...")
+                # Only the server-rendered text is read: return as soon as the
+                # navigation commits and wait for the fields themselves
+                await page.goto(detail_url, wait_until='commit', timeout=self.timeout)
                 try:
-                    from datetime import datetime
-                    parsed_date = datetime.strptime(date_str, '%d/%m/%Y').date()
-                    detail_data['issue_date'] = parsed_date.isoformat()  # YYYY-MM-DD format
+                    await page.wait_for_selector('li:has-text("Mã số thuế")', state='attached', timeout=5000)
                 except Exception:
-                    logger.debug(f"  Could not parse date: {date_str}")
+                    logger.debug(f"  Detail fields not found on {detail_url[:60]}, reading page as is")
 
-            # Status (Trạng thái)
-            status_match = re.search(r'Trạng thái:\s*([^\n]+)', body_text, re.IGNORECASE)
-            if status_match:
-                detail_data['status'] = status_match.group(1).strip()
-
-            # Full address from detail page (more complete than list page)
-            address_match = re.search(r'Địa chỉ(?:\s+thuế)?:\s*([^\n]{20,300})', body_text, re.IGNORECASE)
-            if address_match:
-                full_address = address_match.group(1).strip()
-                if len(full_address) > 20:  # Only update if more detailed
-                    detail_data['address'] = full_address
-
-            logger.debug(f"  ✓ Detail extracted: phone={bool(detail_data.get('phone'))}, legal_rep={bool(detail_data.get('legal_representative'))}")
-
-            return detail_data
+                # Get the fields' text content
+                body_text = await page.evaluate(_DETAIL_TEXT_JS)
+                return self._parse_detail_text(body_text)
 
         except Exception as e:
             logger.debug(f"  ✗ Error scraping detail page: {str(e)}")
             return None
-        finally:
-            await page.close()
+
+    @staticmethod
+    def _parse_detail_text(body_text: str) -> Dict:
+        """
+        Labelled fields of a detail page
+
+        Args:
+            body_text: Text of the detail page
+
+        Returns:
+            Dict with the fields found (empty if none)
+        """
+        # Extract fields from <li> elements: first occurrence of each label
+        fields = {}
+        for match in _DETAIL_FIELDS_RE.finditer(body_text):
+            fields.setdefault(match.lastgroup, match.group(match.lastgroup).strip())
+            if len(fields) == _DETAIL_FIELD_COUNT:
+                break
+
+        detail_data = {}
+
+        # Phone (Điện thoại)
+        if fields.get('phone'):
+            detail_data['phone'] = _WHITESPACE_RE.sub('', fields['phone'])  # Remove spaces
+
+        # Legal representative (Đại diện pháp luật)
+        if fields.get('legal_representative'):
+            detail_data['legal_representative'] = fields['legal_representative']
+
+        # Issue date (Ngày cấp) - format: 21/10/2025
+        date_str = fields.get('issue_date')
+        if date_str:
+            # Parse date
+            try:
+                parsed_date = datetime.strptime(date_str, '%d/%m/%Y').date()
+                detail_data['issue_date'] = parsed_date.isoformat()  # YYYY-MM-DD format
+            except Exception:
+                logger.debug(f"  Could not parse date: {date_str}")
+
+        # Status (Trạng thái)
+        if fields.get('status'):
+            detail_data['status'] = fields['status']
+
+        # Full address from detail page (more complete than list page)
+        full_address = fields.get('address')
+        if full_address and len(full_address) > 20:  # Only update if more detailed
+            detail_data['address'] = full_address
+
+        logger.debug(f"  ✓ Detail extracted: phone={bool(detail_data.get('phone'))}, legal_rep={bool(detail_data.get('legal_representative'))}")
+
+        return detail_data
 
 
 async def test_hsctvn_scraper():
     """Test function"""
-    scraper = HSCTVNScraper(headless=False)
+    scraper = HSCTVNScraper(headless=False, debug=True)
 
     # Test with specific date
     test_date = date(2025, 10, 21)
@@ -0,0 +1,123 @@
+"""
+HTML to plain text for the scrapers' HTTP fast path
+
+Stdlib only, so it is cheap to import in the worker processes that run it.
+"""
+import asyncio
+import codecs
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# HTML is decoded and parsed in slices; parsing stops once more text has been
+# collected than the Gemini prompts can use
+HTML_CHUNK_BYTES = 64 * 1024
+MAX_PAGE_TEXT_CHARS = 100000
+
+# Pure-Python parsing holds the GIL, so it runs in worker processes to keep
+# the event loop (and Playwright's protocol traffic) responsive
+HTML_WORKERS = min(4, os.cpu_count() or 1)
+
+# Source formatting (indentation, line breaks inside a text node) is collapsed
+# like the browser's innerText does; line breaks come from block tags only
+_SOURCE_WHITESPACE_RE = re.compile(r'\s+')
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collect document text, skipping the same elements as the in-browser text fallback"""
+
+    SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'nav', 'footer'})
+    BLOCK_TAGS = frozenset({
+        'p', 'div', 'br', 'li', 'tr', 'td', 'th', 'section', 'article',
+        'header', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'address', 'table', 'ul', 'ol',
+    })
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.text_length = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            data = _SOURCE_WHITESPACE_RE.sub(' ', data)
+            self.parts.append(data)
+            self.text_length += len(data)
+
+
+def html_to_text(body: bytes, encoding: str = 'utf-8') -> str:
+    """
+    Plain text of an HTML document (CPU-bound - see html_to_text_async)
+
+    The body is decoded incrementally, so the whole page never exists as
+    one Python str next to its bytes.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    parser = _HTMLTextExtractor()
+    for start in range(0, len(body), HTML_CHUNK_BYTES):
+        parser.feed(decoder.decode(body[start:start + HTML_CHUNK_BYTES]))
+        if parser.text_length >= MAX_PAGE_TEXT_CHARS:
+            break
+    else:
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    return ''.join(parser.parts)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a process that runs Playwright/loop threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=HTML_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+async def html_to_text_async(body: bytes, encoding: str = 'utf-8') -> str:
+    """
+    html_to_text() in the worker process pool (falls back to a thread if the
+    pool has died, e.g. a worker was killed)
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    try:
+        return await loop.run_in_executor(executor, html_to_text, body, encoding)
+    except BrokenProcessPool:
+        logger.warning("HTML worker pool broken, restarting it")
+        with _executor_lock:
+            # Another call may already have replaced it with a healthy pool
+            if _executor is executor:
+                _executor = None
+        executor.shutdown(wait=False)
+        return await asyncio.to_thread(html_to_text, body, encoding)
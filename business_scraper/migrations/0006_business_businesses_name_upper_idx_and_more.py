@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-15 02:05
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business_scraper', '0005_business_issue_date_business_legal_representative_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='businesses_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(django.db.models.functions.text.Upper('phone'), name='businesses_phone_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='businesses_email_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-15 02:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business_scraper', '0006_business_businesses_name_upper_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchquery',
+            index=models.Index(fields=['-created_at'], name='search_quer_created_824a49_idx'),
+        ),
+    ]
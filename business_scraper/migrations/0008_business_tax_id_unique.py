@@ -0,0 +1,80 @@
+# Generated by Django 5.0.1 on 2026-10-15 02:38
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+
+# Cột được chép từ bản ghi cũ sang bản giữ lại khi bản giữ lại còn trống
+MERGED_FIELDS = (
+    'legal_representative', 'phone', 'email', 'address', 'issue_date', 'status',
+    'website', 'description', 'rating', 'category', 'google_maps_url',
+    'latitude', 'longitude',
+)
+
+
+def merge_duplicate_tax_ids(apps, schema_editor):
+    """
+    Chuẩn bị dữ liệu cũ cho unique constraint: '' -> NULL, và với mỗi mã số
+    thuế bị trùng chỉ giữ bản ghi mới nhất. Cột còn trống của bản giữ lại
+    được lấy từ bản cũ (mới trước), sau đó các bản cũ bị xóa và
+    total_results của search query chứa chúng được trừ đi. Không bảng nào
+    tham chiếu tới businesses nên không cần trỏ lại khóa ngoại. Không đảo
+    ngược được.
+    """
+    Business = apps.get_model('business_scraper', 'Business')
+    SearchQuery = apps.get_model('business_scraper', 'SearchQuery')
+    Business.objects.filter(tax_id='').update(tax_id=None)
+
+    duplicates = (
+        Business.objects.exclude(tax_id=None)
+        .values('tax_id')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+    )
+    removed_per_query = Counter()
+    for row in duplicates:
+        keep, *older = Business.objects.filter(tax_id=row['tax_id']).order_by('-id')
+
+        merged = []
+        for field in MERGED_FIELDS:
+            if getattr(keep, field) in (None, ''):
+                value = next(
+                    (getattr(b, field) for b in older if getattr(b, field) not in (None, '')),
+                    None
+                )
+                if value is not None:
+                    setattr(keep, field, value)
+                    merged.append(field)
+        if merged:
+            keep.save(update_fields=merged)
+
+        removed_per_query.update(b.search_query_id for b in older)
+        Business.objects.filter(id__in=[b.id for b in older]).delete()
+
+    for search_query_id, removed in removed_per_query.items():
+        SearchQuery.objects.filter(id=search_query_id).update(
+            total_results=Greatest(F('total_results') - removed, 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business_scraper', '0007_searchquery_search_quer_created_824a49_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_tax_ids, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='business',
+            name='businesses_tax_id_a4a32e_idx',
+        ),
+        migrations.AlterField(
+            model_name='business',
+            name='tax_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True, verbose_name='Mã số thuế'),
+        ),
+    ]
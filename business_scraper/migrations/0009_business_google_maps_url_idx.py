@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-15 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business_scraper', '0008_business_tax_id_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['google_maps_url'], name='businesses_google__016fdc_idx'),
+        ),
+    ]
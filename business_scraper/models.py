@@ -1,7 +1,9 @@
 """
 Models cho việc lưu trữ thông tin doanh nghiệp từ Google Maps
 """
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 
@@ -39,6 +41,9 @@ class SearchQuery(models.Model):
         verbose_name = 'Truy vấn tìm kiếm'
         verbose_name_plural = 'Truy vấn tìm kiếm'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.keyword} - {self.location or 'No location'}"
@@ -53,7 +58,8 @@ class Business(models.Model):
         verbose_name="Truy vấn tìm kiếm"
     )
     name = models.CharField(max_length=500, verbose_name="Tên doanh nghiệp")
-    tax_id = models.CharField(max_length=50, blank=True, null=True, verbose_name="Mã số thuế")
+    # Unique (NULL được phép lặp lại): HSCTVN upsert theo mã số thuế
+    tax_id = models.CharField(max_length=50, blank=True, null=True, unique=True, verbose_name="Mã số thuế")
     legal_representative = models.CharField(max_length=255, blank=True, null=True, verbose_name="Đại diện pháp luật")
     phone = models.CharField(max_length=50, blank=True, null=True, verbose_name="Số điện thoại")
     email = models.EmailField(blank=True, null=True, verbose_name="Email")
@@ -96,10 +102,17 @@ class Business(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['name']),
-            models.Index(fields=['tax_id']),
             models.Index(fields=['phone']),
+            models.Index(fields=['google_maps_url']),
             models.Index(fields=['email']),
             models.Index(fields=['-created_at']),
+            # Cho admin search: '^name' (UPPER LIKE 'x%'), '=phone', '=email' (UPPER =)
+            models.Index(
+                OpClass(Upper('name'), name='text_pattern_ops'),
+                name='businesses_name_upper_idx',
+            ),
+            models.Index(Upper('phone'), name='businesses_phone_upper_idx'),
+            models.Index(Upper('email'), name='businesses_email_upper_idx'),
         ]
 
     def __str__(self):
@@ -0,0 +1,33 @@
+"""
+JSON renderer dùng orjson cho Ninja API
+"""
+from decimal import Decimal
+from typing import Any
+import orjson
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+_fallback_encoder = NinjaJSONEncoder()
+
+
+def _default(obj: Any) -> Any:
+    """
+    Các kiểu orjson không tự encode: Decimal (rating, latitude, longitude từ
+    .values()) -> số JSON như BusinessSchema, còn lại dùng NinjaJSONEncoder
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return _fallback_encoder.default(obj)
+
+
+def dumps(data: Any) -> bytes:
+    """Encode data thành JSON bytes"""
+    return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+
+    def render(self, request, data: Any, *, response_status: int) -> bytes:
+        return dumps(data)
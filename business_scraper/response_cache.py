@@ -0,0 +1,55 @@
+"""
+Cache ngắn hạn cho các list endpoints (read-only)
+
+Key gồm path + query string + version; version được tăng mỗi khi dữ liệu
+thay đổi (xem signals.py) nên không cần xóa key theo pattern.
+"""
+import hashlib
+from functools import wraps
+from django.core.cache import cache
+from django.http import HttpResponse
+
+LIST_CACHE_TTL = 30
+LIST_CACHE_VERSION_KEY = 'business_api:list_version'
+
+
+def bump_list_cache_version():
+    """Vô hiệu hóa toàn bộ response đã cache của list endpoints"""
+    try:
+        cache.incr(LIST_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(LIST_CACHE_VERSION_KEY, 1, None)
+
+
+async def _cache_key(request) -> str:
+    version = await cache.aget(LIST_CACHE_VERSION_KEY, 0)
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"business_api:list:{version}:{path_hash}"
+
+
+async def _tee_to_cache(content, key):
+    chunks = []
+    async for chunk in content:
+        chunks.append(chunk)
+        yield chunk
+    await cache.aset(key, b''.join(chunks), LIST_CACHE_TTL)
+
+
+def cache_list_response(view):
+    """
+    Decorator cho async list endpoint trả về StreamingHttpResponse:
+    cache hit trả về body đã lưu, cache miss vừa stream vừa ghi vào cache
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        key = await _cache_key(request)
+        body = await cache.aget(key)
+        if body is not None:
+            return HttpResponse(body, content_type='application/json')
+
+        response = await view(request, *args, **kwargs)
+        if getattr(response, 'streaming', False) and response.status_code == 200:
+            response.streaming_content = _tee_to_cache(response.streaming_content, key)
+        return response
+
+    return wrapper
@@ -4,7 +4,6 @@ Pydantic schemas cho API
 from typing import Optional, List
 from datetime import datetime, date
 from ninja import Schema
-from decimal import Decimal
 
 
 class BusinessSchema(Schema):
@@ -20,12 +19,13 @@ class BusinessSchema(Schema):
     status: Optional[str] = None
     website: Optional[str] = None
     description: Optional[str] = None
-    rating: Optional[Decimal] = None
+    # DecimalField trên model, trả về dạng số JSON (float)
+    rating: Optional[float] = None
     reviews_count: int = 0
     category: Optional[str] = None
     google_maps_url: Optional[str] = None
-    latitude: Optional[Decimal] = None
-    longitude: Optional[Decimal] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
     updated_at: datetime
 
@@ -41,6 +41,18 @@ class SearchQuerySchema(Schema):
     status: str
 
 
+class BusinessPageSchema(Schema):
+    """Schema cho một trang businesses (keyset pagination)"""
+    results: List[BusinessSchema] = []
+    next_cursor: Optional[int] = None
+
+
+class SearchQueryPageSchema(Schema):
+    """Schema cho một trang search queries (keyset pagination)"""
+    results: List[SearchQuerySchema] = []
+    next_cursor: Optional[int] = None
+
+
 class SearchQueryDetailSchema(SearchQuerySchema):
     """Schema chi tiết cho truy vấn tìm kiếm kèm danh sách doanh nghiệp"""
     businesses: List[BusinessSchema] = []
@@ -5,12 +5,98 @@ Based on actual Google Maps HTML structure
 import re
 import asyncio
 import logging
-from typing import List, Dict, Optional
-from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeout
+import unicodedata
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeout
 from django.conf import settings
+from .browser import LAUNCH_ARGS, get_browser, run_in_browser_loop
 
 logger = logging.getLogger(__name__)
 
+# Compiled once - used for every place detail page
+_RATING_RE = re.compile(r'([\d,\.]+)\s*sao')
+_REVIEWS_RE = re.compile(r'([\d\.]+)\s*bài đánh giá')
+_COORDS_AT_RE = re.compile(r'@(-?\d+\.\d+),(-?\d+\.\d+)')
+_COORDS_DATA_RE = re.compile(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)')
+# Shortest phone number kept (1900/1800 hotlines have 8 digits)
+_MIN_PHONE_DIGITS = 8
+
+# Panel headings that aren't place names
+_UI_NAMES = frozenset({'Kết quả', 'Results'})
+
+# Not needed for text extraction: map tiles/photos, video, fonts and analytics
+# beacons (stylesheets stay - the feed only scrolls with its CSS)
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+_BLOCKED_HOSTS = ('google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googleadservices.com')
+
+# Per result item from index `start` on (earlier ones were already read):
+# aria-label and place URL of the link a.hfpxzc and whether it's sponsored
+# (.jHLihd), plus the total item count
+_ITEM_SUMMARIES_JS = """(items, start) => ({
+    count: items.length,
+    summaries: items.slice(start).map(item => {
+        const link = item.querySelector('a.hfpxzc');
+        return {
+            label: link ? link.getAttribute('aria-label') : null,
+            href: link ? link.href : null,
+            sponsored: !!item.querySelector('.jHLihd')
+        };
+    })
+})"""
+# Same, starting from the links (when the items have no div.Nv2PK)
+_LINK_SUMMARIES_JS = """(links, start) => ({
+    count: links.length,
+    summaries: links.slice(start).map(link => {
+        const item = link.closest('div.Nv2PK');
+        return {
+            label: link.getAttribute('aria-label'),
+            href: link.href,
+            sponsored: !!(item && item.querySelector('.jHLihd'))
+        };
+    })
+})"""
+# Place detail panel, every field in one round-trip. HTML structure:
+#   <h1 class="DUwDvf">NAME</h1>
+#   <div class="m6QErb" role="region" aria-label="Thông tin về NAME">
+#   <button jsaction="...category...">CATEGORY</button>
+#   <span class="ZkP5Je" role="img" aria-label="4,9 sao 31 bài đánh giá">
+#   <button data-item-id="address"><div class="Io6YTe">ADDRESS</div></button>
+#   <button data-item-id="phone:tel:0369626262"><div class="Io6YTe">+84 369 626 262</div></button>
+#   <a data-item-id="authority" href="WEBSITE">
+_PLACE_DETAILS_JS = """() => {
+    const text = (selector) => {
+        const el = document.querySelector(selector);
+        return el ? el.innerText.trim() : null;
+    };
+    const attr = (selector, name) => {
+        const el = document.querySelector(selector);
+        return el ? el.getAttribute(name) : null;
+    };
+    return {
+        name: text('h1.DUwDvf'),
+        panel_label: attr('div.m6QErb[role="region"]', 'aria-label'),
+        category: text('button[jsaction*="category"]'),
+        rating_label: attr('span.ZkP5Je[role="img"]', 'aria-label'),
+        address: text('button[data-item-id="address"] div.Io6YTe'),
+        phone: text('button[data-item-id^="phone"] div.Io6YTe'),
+        website: attr('a[data-item-id="authority"]', 'href')
+    };
+}"""
+# Feed scrolls while collecting place links (stops earlier once the feed stops growing)
+_MAX_FEED_SCROLLS = 10
+# True once the feed has more place links than before the scroll
+_FEED_GREW_JS = "(count) => document.querySelectorAll('a.hfpxzc').length > count"
+
+
+def _name_key(name: str) -> str:
+    """
+    Dedup key for a place name: the same place can come back with other
+    casing, spacing or Unicode normalization (precomposed vs combining
+    diacritics)
+    """
+    return ' '.join(unicodedata.normalize('NFC', name).casefold().split())
+
 
 class GoogleMapsScraper:
     """Scraper V4.0 - Exact selectors from real HTML"""
@@ -19,6 +105,11 @@ class GoogleMapsScraper:
         self.headless = settings.SCRAPER_HEADLESS
         self.timeout = settings.SCRAPER_TIMEOUT
         self.max_results = settings.MAX_RESULTS_PER_SEARCH
+        self.concurrency = settings.GOOGLE_MAPS_CONCURRENCY
+        # Context on the shared Chromium, kept across searches until close()
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self._context_lock: Optional[asyncio.Lock] = None
 
     async def search_businesses(
         self,
@@ -38,121 +129,203 @@ class GoogleMapsScraper:
         logger.info(f"=== SCRAPER V4.0 ===")
         logger.info(f"Search: {search_query}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            context = await browser.new_context(
+        return await run_in_browser_loop(self._search(search_query, max_results))
+
+    async def close(self):
+        """Close the browser context and its pages (the shared browser stays up)"""
+        await run_in_browser_loop(self._close_context())
+
+    async def _ensure_context(self):
+        """
+        Create the context on first use (or after the browser went away);
+        later searches - including concurrent ones - reuse it
+        """
+        if self._context_lock is None:
+            self._context_lock = asyncio.Lock()
+
+        async with self._context_lock:
+            if self.context is not None and self.browser.is_connected():
+                return
+            # Shared, already-running Chromium (launched on first use)
+            self.browser = await get_browser(self.headless, LAUNCH_ARGS)
+            context = await self.browser.new_context(
                 viewport={'width': 1920, 'height': 1080},
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 locale='vi-VN'
             )
-            page = await context.new_page()
+            try:
+                await context.route('**/*', self._block_heavy_resources)
+            except Exception:
+                await context.close()
+                raise
+            self.context = context
 
+    async def _close_context(self):
+        context, self.context = self.context, None
+        if context is not None:
             try:
-                url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
-                logger.info(f"URL: {url}")
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Context close error: {e}")
 
-                await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
-                await asyncio.sleep(5)
+    async def _search(self, search_query: str, max_results: int) -> List[Dict]:
+        """search_businesses() body - runs on the shared browser loop"""
+        await self._ensure_context()
+        page = await self.context.new_page()
 
-                businesses = await self._extract_businesses(page, max_results)
+        try:
+            url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+            logger.info(f"URL: {url}")
 
-                logger.info(f"✓ Total found: {len(businesses)}")
-                return businesses
+            # _extract_businesses waits for the feed itself
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
 
-            except Exception as e:
-                logger.error(f"Error: {str(e)}", exc_info=True)
-                raise
-            finally:
-                await browser.close()
+            businesses = await self._extract_businesses(page, max_results)
+
+            logger.info(f"✓ Total found: {len(businesses)}")
+            return businesses
+
+        except Exception as e:
+            logger.error(f"Error: {str(e)}", exc_info=True)
+            raise
+        finally:
+            await page.close()
+
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """Route handler: abort resource types and analytics hosts the scraper doesn't need"""
+        request = route.request
+        host = urlparse(request.url).hostname or ''
+        if request.resource_type in _BLOCKED_RESOURCE_TYPES or host.endswith(_BLOCKED_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def _extract_businesses(self, page: Page, max_results: int) -> List[Dict]:
-        """Extract businesses với EXACT selectors"""
+        """
+        Extract businesses với EXACT selectors
+
+        Place links are collected from the feed first; the place pages are
+        then opened in up to `concurrency` tabs at once instead of clicking
+        through the cards one by one.
+        """
 
         businesses = []
         seen_names = set()
 
         # Wait for feed
         try:
-            await page.wait_for_selector('div[role="feed"]', timeout=10000)
+            await page.wait_for_selector('div[role="feed"]', timeout=self.timeout)
             logger.info("✓ Feed found")
         except:
             logger.error("✗ Feed not found")
             return businesses
 
-        # Scroll để load items
-        await self._scroll_feed(page)
-        await asyncio.sleep(3)
-
-        # Get business items - EXACT selector: div.Nv2PK
-        business_items = await page.query_selector_all('div.Nv2PK')
-        logger.info(f"✓ Found {len(business_items)} business items (div.Nv2PK)")
-
-        if not business_items:
-            # Fallback: try a.hfpxzc
-            links = await page.query_selector_all('a.hfpxzc')
-            logger.info(f"Fallback: Found {len(links)} links (a.hfpxzc)")
-
-            # Filter links to get parent divs
-            for link in links:
-                parent = await link.evaluate_handle('el => el.closest("div.Nv2PK")')
-                if parent:
-                    business_items.append(parent)
-
-        # Extract from each item
-        for idx, item in enumerate(business_items[:max_results * 2]):
-            if len(businesses) >= max_results:
+        # Scroll để load items, until there are enough candidates. Only the
+        # items added by each scroll are read again
+        seen_hrefs = set()
+        candidates, scanned = await self._collect_places(page, 0, seen_hrefs)
+        for _ in range(_MAX_FEED_SCROLLS):
+            if len(candidates) >= max_results * 2:
                 break
 
+            loaded = await self._scroll_feed(page)
             try:
-                # Get link element
-                link = await item.query_selector('a.hfpxzc')
-                if not link:
-                    continue
-
-                # Get aria-label for logging
-                aria_label = await link.get_attribute('aria-label')
-                if not aria_label:
-                    continue
-
-                # Skip sponsored items
-                sponsored = await item.query_selector('.jHLihd')
-                if sponsored:
-                    logger.debug(f"Skip sponsored: {aria_label[:40]}")
-                    continue
-
-                logger.info(f"[{idx+1}] Clicking: {aria_label[:60]}")
+                await page.wait_for_function(_FEED_GREW_JS, arg=loaded, timeout=5000)
+            except PlaywrightTimeout:
+                # Nothing new after the scroll: end of the results
+                break
+            new_places, scanned = await self._collect_places(page, scanned, seen_hrefs)
+            candidates.extend(new_places)
+
+        candidates = candidates[:max_results * 2]
+        logger.info(f"✓ Found {len(candidates)} places to extract")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Name keys of the results the merge below will keep; enough of them
+        # means the remaining candidates need not be opened
+        extracted_keys = set()
+
+        async def extract_one(idx: int, place: Dict) -> Optional[Dict]:
+            async with semaphore:
+                if len(extracted_keys) >= max_results:
+                    return None
+
+                logger.info(f"[{idx+1}] Opening: {place['label'][:60]}")
+                detail_page = await page.context.new_page()
+                try:
+                    await detail_page.goto(place['href'], wait_until='domcontentloaded', timeout=self.timeout)
+                    try:
+                        await detail_page.wait_for_selector('h1.DUwDvf', timeout=5000)
+                    except PlaywrightTimeout:
+                        # _extract_details still tries the panel's aria-label
+                        logger.debug(f"No place heading for {place['label'][:40]}")
+
+                    business_data = await self._extract_details(detail_page)
+                except Exception as e:
+                    logger.error(f"Error item {idx}: {str(e)}")
+                    return None
+                finally:
+                    await detail_page.close()
+
+                if business_data and business_data['name'] not in _UI_NAMES:
+                    extracted_keys.add(_name_key(business_data['name']))
+                return business_data
+
+        results = await asyncio.gather(*[extract_one(idx, place) for idx, place in enumerate(candidates)])
+
+        # Merge in feed order
+        for business_data in results:
+            if len(businesses) >= max_results:
+                break
+            if not business_data or not business_data.get('name'):
+                continue
 
-                # Scroll and click
-                await link.scroll_into_view_if_needed()
-                await asyncio.sleep(0.5)
-                await link.click()
-                await asyncio.sleep(3)
+            name = business_data['name']
 
-                # Extract details
-                business_data = await self._extract_details(page)
+            # Skip UI elements
+            if name in _UI_NAMES:
+                continue
 
-                if business_data and business_data.get('name'):
-                    name = business_data['name']
+            name_key = _name_key(name)
+            if name_key not in seen_names:
+                businesses.append(business_data)
+                seen_names.add(name_key)
+                logger.info(f"✓ [{len(businesses)}/{max_results}] {name}")
 
-                    # Skip UI elements
-                    if name in ['Kết quả', 'Results']:
-                        continue
+        return businesses
 
-                    if name not in seen_names:
-                        businesses.append(business_data)
-                        seen_names.add(name)
-                        logger.info(f"✓ [{len(businesses)}/{max_results}] {name}")
+    async def _collect_places(self, page: Page, start: int, seen_hrefs: set) -> Tuple[List[Dict], int]:
+        """
+        Place links in the feed from item `start` on (one round-trip),
+        without sponsored items and links already in `seen_hrefs`
+
+        Args:
+            page: Search results page
+            start: Number of feed items already read by earlier calls
+            seen_hrefs: Place URLs already collected; new ones are added
+
+        Returns:
+            (list of {label, href} in feed order, total number of feed items)
+        """
+        scan = await page.eval_on_selector_all('div.Nv2PK', _ITEM_SUMMARIES_JS, start)
+        if not scan['count']:
+            # Fallback: try a.hfpxzc
+            scan = await page.eval_on_selector_all('a.hfpxzc', _LINK_SUMMARIES_JS, start)
 
-            except Exception as e:
-                logger.error(f"Error item {idx}: {str(e)}")
+        places = []
+        for summary in scan['summaries']:
+            if not summary['label'] or not summary['href'] or summary['href'] in seen_hrefs:
                 continue
+            seen_hrefs.add(summary['href'])
 
-            # Scroll and reload
-            if (idx + 1) % 5 == 0 and len(businesses) < max_results:
-                await self._scroll_feed(page)
-                await asyncio.sleep(2)
+            # Skip sponsored items
+            if summary['sponsored']:
+                logger.debug(f"Skip sponsored: {summary['label'][:40]}")
+                continue
 
-        return businesses
+            places.append({'label': summary['label'], 'href': summary['href']})
+        return places, scan['count']
 
     async def _extract_details(self, page: Page) -> Optional[Dict]:
         """Extract chi tiết với EXACT selectors"""
@@ -180,131 +353,89 @@ class GoogleMapsScraper:
             if coords:
                 data['latitude'], data['longitude'] = coords
 
-            # Wait a bit
-            await asyncio.sleep(1)
+            # All fields of the panel in one round-trip
+            fields = await page.evaluate(_PLACE_DETAILS_JS)
 
-            # NAME - Multiple strategies based on REAL HTML
-            try:
-                # Strategy 1: Try h1 (common in some detail panels)
-                name_elem = await page.query_selector('h1.DUwDvf')
-                if name_elem:
-                    name_text = (await name_elem.inner_text()).strip()
-                    if name_text and name_text not in ['Kết quả', 'Results']:
-                        data['name'] = name_text
-
-                # Strategy 2: Parse from detail panel aria-label
-                # <div class="m6QErb" role="region" aria-label="Thông tin về [NAME]">
-                if not data['name']:
-                    panel = await page.query_selector('div.m6QErb[role="region"]')
-                    if panel:
-                        aria_label = await panel.get_attribute('aria-label')
-                        if aria_label and 'Thông tin về' in aria_label:
-                            # Extract name after "Thông tin về "
-                            name_text = aria_label.replace('Thông tin về', '').strip()
-                            if name_text and name_text not in ['Kết quả', 'Results']:
-                                data['name'] = name_text
-
-                # Strategy 3: From link we clicked (stored in aria-label)
-                # We can pass this from the calling function
+            # NAME - Strategy 1: h1 (common in some detail panels)
+            name_text = fields['name']
+            if name_text and name_text not in _UI_NAMES:
+                data['name'] = name_text
 
-            except Exception as e:
-                logger.debug(f"Name extraction error: {e}")
-                pass
+            # Strategy 2: Parse from detail panel aria-label
+            # <div class="m6QErb" role="region" aria-label="Thông tin về [NAME]">
+            aria_label = fields['panel_label']
+            if not data['name'] and aria_label and 'Thông tin về' in aria_label:
+                # Extract name after "Thông tin về "
+                name_text = aria_label.replace('Thông tin về', '').strip()
+                if name_text and name_text not in _UI_NAMES:
+                    data['name'] = name_text
 
             if not data['name']:
                 logger.warning("Could not extract business name")
                 return None
 
-            # CATEGORY - button with jsaction*="category"
-            try:
-                cat = await page.query_selector('button[jsaction*="category"]')
-                if cat:
-                    cat_text = (await cat.inner_text()).strip()
-                    if cat_text and 'Cập nhật' not in cat_text:
-                        data['category'] = cat_text
-            except:
-                pass
-
-            # RATING - span.ZkP5Je with role="img"
-            try:
-                rating_elem = await page.query_selector('span.ZkP5Je[role="img"]')
-                if rating_elem:
-                    aria = await rating_elem.get_attribute('aria-label')
-                    if aria:
-                        # Extract rating: "4,9 sao 31 bài đánh giá"
-                        rating_match = re.search(r'([\d,\.]+)\s*sao', aria)
-                        if rating_match:
-                            data['rating'] = float(rating_match.group(1).replace(',', '.'))
-
-                        # Extract reviews: "31 bài đánh giá"
-                        reviews_match = re.search(r'([\d\.]+)\s*bài đánh giá', aria)
-                        if reviews_match:
-                            data['reviews_count'] = int(reviews_match.group(1).replace('.', ''))
-            except:
-                pass
-
-            # ADDRESS - EXACT selector from real HTML
-            # <button data-item-id="address"><div class="Io6YTe">ADDRESS</div></button>
-            try:
-                addr_elem = await page.query_selector('button[data-item-id="address"] div.Io6YTe')
-                if addr_elem:
-                    addr_text = (await addr_elem.inner_text()).strip()
-                    if addr_text and len(addr_text) > 5:
-                        data['address'] = addr_text
-            except Exception as e:
-                logger.debug(f"Address extraction error: {e}")
-                pass
-
-            # PHONE - EXACT selector from real HTML
-            # <button data-item-id="phone:tel:0369626262"><div class="Io6YTe">+84 369 626 262</div></button>
-            try:
-                phone_elem = await page.query_selector('button[data-item-id^="phone"] div.Io6YTe')
-                if phone_elem:
-                    phone_text = (await phone_elem.inner_text()).strip()
-                    # Validate it looks like a phone number
-                    if phone_text and re.search(r'[\d\+\s\-\(\)]{8,}', phone_text):
-                        data['phone'] = phone_text
-            except Exception as e:
-                logger.debug(f"Phone extraction error: {e}")
-                pass
-
-            # WEBSITE - a[data-item-id="authority"]
-            try:
-                web = await page.query_selector('a[data-item-id="authority"]')
-                if web:
-                    href = await web.get_attribute('href')
-                    if href and 'google.com' not in href:
-                        data['website'] = href
-            except:
-                pass
+            # CATEGORY
+            cat_text = fields['category']
+            if cat_text and 'Cập nhật' not in cat_text:
+                data['category'] = cat_text
+
+            # RATING - "4,9 sao 31 bài đánh giá"
+            aria = fields['rating_label']
+            if aria:
+                try:
+                    rating_match = _RATING_RE.search(aria)
+                    if rating_match:
+                        data['rating'] = float(rating_match.group(1).replace(',', '.'))
+
+                    reviews_match = _REVIEWS_RE.search(aria)
+                    if reviews_match:
+                        data['reviews_count'] = int(reviews_match.group(1).replace('.', ''))
+                except ValueError:
+                    pass
+
+            # ADDRESS
+            addr_text = fields['address']
+            if addr_text and len(addr_text) > 5:
+                data['address'] = addr_text
+
+            # PHONE - validate it looks like a phone number
+            phone_text = fields['phone']
+            if phone_text and sum(c.isdigit() for c in phone_text) >= _MIN_PHONE_DIGITS:
+                data['phone'] = phone_text
+
+            # WEBSITE
+            href = fields['website']
+            if href and 'google.com' not in href:
+                data['website'] = href
 
         except Exception as e:
             logger.error(f"Extract details error: {str(e)}")
 
         return data if data.get('name') else None
 
-    async def _scroll_feed(self, page: Page):
-        """Scroll results feed"""
+    async def _scroll_feed(self, page: Page) -> int:
+        """Scroll results feed; returns the number of place links loaded before the scroll"""
         try:
-            await page.evaluate("""
+            return await page.evaluate("""
                 () => {
                     const feed = document.querySelector('div[role="feed"]');
                     if (feed) {
                         feed.scrollBy(0, 1500);
                     }
+                    return document.querySelectorAll('a.hfpxzc').length;
                 }
             """)
         except:
-            pass
+            return 0
 
     def _extract_coords(self, url: str) -> Optional[tuple]:
         """Extract coordinates from URL"""
         try:
-            match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
+            match = _COORDS_AT_RE.search(url)
             if match:
                 return (float(match.group(1)), float(match.group(2)))
 
-            match = re.search(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)', url)
+            match = _COORDS_DATA_RE.search(url)
             if match:
                 return (float(match.group(1)), float(match.group(2)))
         except:
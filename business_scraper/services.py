@@ -1,17 +1,43 @@
 """
 Business logic layer cho scraper
 """
+import asyncio
 import logging
-from datetime import datetime
-from typing import List, Dict
+from contextlib import aclosing
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Dict, AsyncIterator, Optional, Tuple
 from asgiref.sync import sync_to_async
+from django.db import transaction
 from .models import SearchQuery, Business
 from .scraper import GoogleMapsScraper
 from .duckduckgo_scraper import DuckDuckGoScraper
 from .hsctvn_scraper import HSCTVNScraper
+from .response_cache import bump_list_cache_version
 
 logger = logging.getLogger(__name__)
 
+# Các cột trả về cho list endpoints (khớp với BusinessSchema / SearchQuerySchema)
+BUSINESS_FIELDS = (
+    'id', 'name', 'tax_id', 'legal_representative', 'phone', 'email', 'address',
+    'issue_date', 'status', 'website', 'description', 'rating', 'reviews_count',
+    'category', 'google_maps_url', 'latitude', 'longitude', 'created_at', 'updated_at',
+)
+SEARCH_QUERY_FIELDS = (
+    'id', 'keyword', 'location', 'source', 'created_at', 'total_results', 'status',
+)
+LIST_CHUNK_SIZE = 2000
+SAVE_BATCH_SIZE = 500
+
+# Cột có thể được ghi đè khi upsert theo tax_id: chỉ những cột mà lần scrape
+# có dữ liệu (trang chi tiết lỗi không xóa SĐT, ngày cấp... đã lưu). Giữ
+# nguyên id, created_at và search_query (dòng vẫn thuộc lần tìm kiếm đầu tiên)
+BUSINESS_UPSERT_FIELDS = (
+    'name', 'legal_representative', 'phone', 'email', 'address',
+    'issue_date', 'status', 'website', 'description', 'rating', 'reviews_count',
+    'category', 'google_maps_url', 'latitude', 'longitude',
+)
+
 
 class BusinessScraperService:
     """Service class để xử lý business logic"""
@@ -39,7 +65,7 @@ class BusinessScraperService:
             SearchQuery: Object search query đã được lưu
         """
         # Tạo search query record
-        search_query = await sync_to_async(SearchQuery.objects.create)(
+        search_query = await SearchQuery.objects.acreate(
             keyword=keyword,
             location=location,
             source='google_maps',
@@ -60,7 +86,7 @@ class BusinessScraperService:
             # Cập nhật search query
             search_query.total_results = saved_count
             search_query.status = 'completed'
-            await sync_to_async(search_query.save)()
+            await search_query.asave(update_fields=['total_results', 'status'])
 
             logger.info(f"Đã lưu {saved_count} doanh nghiệp cho keyword: {keyword}")
 
@@ -70,7 +96,7 @@ class BusinessScraperService:
             # Cập nhật trạng thái lỗi
             search_query.status = 'failed'
             search_query.error_message = str(e)
-            await sync_to_async(search_query.save)()
+            await search_query.asave(update_fields=['status', 'error_message'])
 
             logger.error(f"Lỗi khi scrape và lưu dữ liệu: {str(e)}")
             raise
@@ -93,7 +119,7 @@ class BusinessScraperService:
             SearchQuery: Object search query đã được lưu
         """
         # Tạo search query record
-        search_query = await sync_to_async(SearchQuery.objects.create)(
+        search_query = await SearchQuery.objects.acreate(
             keyword=keyword,
             location=location,
             source='duckduckgo',
@@ -114,7 +140,7 @@ class BusinessScraperService:
             # Cập nhật search query
             search_query.total_results = saved_count
             search_query.status = 'completed'
-            await sync_to_async(search_query.save)()
+            await search_query.asave(update_fields=['total_results', 'status'])
 
             logger.info(f"Đã lưu {saved_count} doanh nghiệp từ DuckDuckGo cho keyword: {keyword}")
 
@@ -124,11 +150,49 @@ class BusinessScraperService:
             # Cập nhật trạng thái lỗi
             search_query.status = 'failed'
             search_query.error_message = str(e)
-            await sync_to_async(search_query.save)()
+            await search_query.asave(update_fields=['status', 'error_message'])
 
             logger.error(f"Lỗi khi scrape DuckDuckGo và lưu dữ liệu: {str(e)}")
             raise
 
+    async def scrape_all_sources(
+        self,
+        keyword: str,
+        location: Optional[str] = None,
+        max_results: int = 20,
+        duckduckgo_max_results: Optional[int] = None
+    ) -> List[SearchQuery]:
+        """
+        Scrape Google Maps và DuckDuckGo đồng thời cho cùng từ khóa (thời gian
+        chờ mạng của hai nguồn chồng lên nhau thay vì cộng dồn)
+
+        Args:
+            keyword: Từ khóa tìm kiếm
+            location: Địa điểm (optional)
+            max_results: Số lượng kết quả tối đa mỗi nguồn
+            duckduckgo_max_results: Giới hạn riêng cho DuckDuckGo (None = max_results)
+
+        Returns:
+            List[SearchQuery]: Search query của các nguồn thành công (nguồn lỗi
+            đã được đánh dấu 'failed' trong database)
+        """
+        results = await asyncio.gather(
+            self.scrape_and_save(keyword, location, max_results),
+            self.scrape_duckduckgo_and_save(keyword, location, duckduckgo_max_results or max_results),
+            return_exceptions=True
+        )
+
+        search_queries = []
+        for source, result in zip(('Google Maps', 'DuckDuckGo'), results):
+            if isinstance(result, BaseException):
+                logger.error(f"Lỗi khi scrape {source}: {str(result)}")
+                continue
+            search_queries.append(result)
+
+        if not search_queries:
+            raise results[0]
+        return search_queries
+
     async def scrape_hsctvn_and_save(
         self,
         scrape_date: str,
@@ -150,7 +214,7 @@ class BusinessScraperService:
         date_obj = datetime.strptime(scrape_date, '%Y-%m-%d').date()
 
         # Tạo search query record
-        search_query = await sync_to_async(SearchQuery.objects.create)(
+        search_query = await SearchQuery.objects.acreate(
             keyword=f"HSCTVN - {scrape_date}",
             location=None,
             source='hsctvn',
@@ -158,20 +222,28 @@ class BusinessScraperService:
         )
 
         try:
-            # Scrape dữ liệu từ HSCTVN
-            businesses_data = await self.hsctvn_scraper.scrape(
+            # Scrape dữ liệu từ HSCTVN, lưu theo từng batch khi kết quả về
+            # (không giữ toàn bộ kết quả scrape trong RAM)
+            saved_count = 0
+            batch = []
+            companies = self.hsctvn_scraper.iter_scrape(
                 scrape_date=date_obj,
                 max_results=max_results,
                 max_pages=max_pages
             )
-
-            # Lưu businesses vào database
-            saved_count = await self._save_businesses(search_query, businesses_data)
+            async with aclosing(companies):
+                async for business_data in companies:
+                    batch.append(business_data)
+                    if len(batch) >= SAVE_BATCH_SIZE:
+                        saved_count += await self._save_businesses(search_query, batch)
+                        batch = []
+            if batch:
+                saved_count += await self._save_businesses(search_query, batch)
 
             # Cập nhật search query
             search_query.total_results = saved_count
             search_query.status = 'completed'
-            await sync_to_async(search_query.save)()
+            await search_query.asave(update_fields=['total_results', 'status'])
 
             logger.info(f"Đã lưu {saved_count} doanh nghiệp từ HSCTVN cho ngày: {scrape_date}")
 
@@ -181,7 +253,7 @@ class BusinessScraperService:
             # Cập nhật trạng thái lỗi
             search_query.status = 'failed'
             search_query.error_message = str(e)
-            await sync_to_async(search_query.save)()
+            await search_query.asave(update_fields=['status', 'error_message'])
 
             logger.error(f"Lỗi khi scrape HSCTVN và lưu dữ liệu: {str(e)}")
             raise
@@ -194,6 +266,12 @@ class BusinessScraperService:
         """
         Lưu danh sách businesses vào database
 
+        Cả batch được ghi bằng bulk_create (SAVE_BATCH_SIZE dòng mỗi câu lệnh)
+        thay vì một INSERT cho từng doanh nghiệp; kiểm tra trùng SĐT và trùng
+        link Google Maps mỗi loại chỉ tốn một query. Business có mã số thuế được upsert (INSERT ... ON
+        CONFLICT (tax_id) DO UPDATE): scrape lại cùng ngày sẽ cập nhật bản ghi
+        cũ thay vì tạo bản trùng.
+
         Args:
             search_query: Search query object
             businesses_data: Danh sách dữ liệu business
@@ -201,33 +279,102 @@ class BusinessScraperService:
         Returns:
             int: Số lượng business đã lưu
         """
-        saved_count = 0
+        # SĐT đã có trong DB -> các mã số thuế đang dùng SĐT đó
+        phones = {b['phone'] for b in businesses_data if b.get('phone')}
+        phone_owners = {}
+        if phones:
+            async for phone, tax_id in Business.objects.filter(phone__in=phones).values_list('phone', 'tax_id'):
+                phone_owners.setdefault(phone, set()).add(tax_id)
+
+        # Địa điểm Google Maps đã lưu (scrape lại cùng từ khóa không tạo bản trùng)
+        maps_urls = {b['google_maps_url'] for b in businesses_data if b.get('google_maps_url')}
+        seen_maps_urls = set()
+        if maps_urls:
+            seen_maps_urls = {
+                url async for url in
+                Business.objects.filter(google_maps_url__in=maps_urls).values_list('google_maps_url', flat=True)
+            }
+
+        # Dựng object Business (thuần CPU) trong thread để không chặn event loop
+        inserts, upserts = await asyncio.to_thread(
+            self._build_businesses, search_query, businesses_data, phone_owners, seen_maps_urls
+        )
+
+        if not inserts and not upserts:
+            return 0
+
+        saved_count = await sync_to_async(self._write_businesses)(inserts, upserts)
+
+        if saved_count:
+            # bulk_create không gửi post_save
+            bump_list_cache_version()
+
+        return saved_count
+
+    @staticmethod
+    def _build_businesses(
+        search_query: SearchQuery,
+        businesses_data: List[Dict],
+        phone_owners: Dict[str, set],
+        seen_maps_urls: set
+    ) -> Tuple[List[Business], Dict[Tuple[str, ...], List[Business]]]:
+        """
+        Lọc trùng và dựng object Business cho một batch (không truy vấn DB)
+
+        Args:
+            search_query: Search query object
+            businesses_data: Danh sách dữ liệu business
+            phone_owners: SĐT -> các mã số thuế đang dùng (được cập nhật)
+            seen_maps_urls: Link Google Maps đã lưu (được cập nhật)
+
+        Returns:
+            (business thêm mới, business upsert theo mã số thuế nhóm theo
+            các cột cần cập nhật)
+        """
+        inserts = []
+        upserts = {}
+        # Ngày cấp -> date (HSCTVN: cả lô thường cùng một ngày cấp)
+        parsed_dates = {}
 
         for business_data in businesses_data:
             try:
-                # Parse issue_date if string
+                # Parse issue_date if string (YYYY-MM-DD)
                 issue_date = business_data.get('issue_date')
                 if issue_date and isinstance(issue_date, str):
-                    try:
-                        from datetime import datetime
-                        issue_date = datetime.strptime(issue_date, '%Y-%m-%d').date()
-                    except Exception:
-                        issue_date = None
+                    if issue_date not in parsed_dates:
+                        try:
+                            parsed_dates[issue_date] = date.fromisoformat(issue_date)
+                        except ValueError:
+                            parsed_dates[issue_date] = None
+                    issue_date = parsed_dates[issue_date]
 
-                # Check for duplicates by phone
+                tax_id = business_data.get('tax_id') or None
+
+                # Check for duplicates by phone (cùng mã số thuế là cùng
+                # doanh nghiệp -> cập nhật, không bỏ qua)
                 phone = business_data.get('phone')
                 if phone:
-                    exists = await sync_to_async(Business.objects.filter(phone=phone).exists)()
-                    if exists:
+                    owners = phone_owners.setdefault(phone, set())
+                    if owners - {tax_id} or (owners and not tax_id):
                         logger.info(f"Bỏ qua doanh nghiệp trùng SĐT: {phone}")
                         continue
 
-                await sync_to_async(Business.objects.create)(
+                maps_url = business_data.get('google_maps_url')
+                if maps_url:
+                    if maps_url in seen_maps_urls:
+                        logger.info(f"Bỏ qua doanh nghiệp trùng link Google Maps: {business_data.get('name')}")
+                        continue
+                    seen_maps_urls.add(maps_url)
+
+                if phone:
+                    owners.add(tax_id)
+
+                business = Business(
                     search_query=search_query,
                     name=business_data.get('name', ''),
-                    tax_id=business_data.get('tax_id'),
+                    tax_id=tax_id,
                     legal_representative=business_data.get('legal_representative'),
-                    phone=business_data.get('phone'),
+                    phone=phone,
                     email=business_data.get('email'),
                     address=business_data.get('address'),
                     issue_date=issue_date,
@@ -237,15 +384,93 @@ class BusinessScraperService:
                     rating=business_data.get('rating'),
                     reviews_count=business_data.get('reviews_count', 0),
                     category=business_data.get('category'),
-                    google_maps_url=business_data.get('google_maps_url'),
+                    google_maps_url=maps_url,
                     latitude=business_data.get('latitude'),
                     longitude=business_data.get('longitude'),
                 )
-                saved_count += 1
+
+                if tax_id:
+                    # Trùng tax_id trong cùng batch: giữ bản sau (ON CONFLICT
+                    # không cho cập nhật một dòng hai lần trong một câu lệnh)
+                    values = {**business_data, 'issue_date': issue_date}
+                    update_fields = tuple(
+                        field for field in BUSINESS_UPSERT_FIELDS
+                        if values.get(field) not in (None, '')
+                    ) + ('updated_at',)
+                    upserts[tax_id] = (business, update_fields)
+                else:
+                    inserts.append(business)
             except Exception as e:
-                logger.error(f"Lỗi khi lưu business {business_data.get('name')}: {str(e)}")
+                logger.error(f"Lỗi khi chuẩn bị business {business_data.get('name')}: {str(e)}")
                 continue
 
+        upsert_groups = {}
+        for business, update_fields in upserts.values():
+            upsert_groups.setdefault(update_fields, []).append(business)
+        return inserts, upsert_groups
+
+    @staticmethod
+    def _write_businesses(inserts: List[Business], upserts: Dict[Tuple[str, ...], List[Business]]) -> int:
+        """
+        Ghi một batch trong một transaction (một lần commit)
+
+        transaction.atomic chưa dùng được trong code async nên hàm này
+        chạy qua sync_to_async. Mỗi câu lệnh có savepoint riêng: insert
+        lỗi không làm mất phần upsert và ngược lại.
+
+        Args:
+            inserts: Business thêm mới
+            upserts: Business upsert theo mã số thuế, theo các cột cần cập nhật
+
+        Returns:
+            int: Số lượng business đã lưu
+        """
+        saved_count = 0
+
+        with transaction.atomic():
+            if inserts:
+                saved_count += BusinessScraperService._bulk_write(inserts, 'lưu')
+
+            for update_fields, businesses in upserts.items():
+                saved_count += BusinessScraperService._bulk_write(
+                    businesses,
+                    'upsert',
+                    update_conflicts=True,
+                    unique_fields=['tax_id'],
+                    update_fields=update_fields,
+                )
+
+        return saved_count
+
+    @staticmethod
+    def _bulk_write(businesses: List[Business], action: str, **options) -> int:
+        """
+        bulk_create cả batch; nếu lỗi thì ghi lại từng dòng (mỗi dòng một
+        savepoint) để chỉ bỏ những dòng hỏng, ví dụ SĐT dài quá max_length
+
+        Args:
+            businesses: Business cần ghi
+            action: Tên thao tác cho log
+            **options: Tham số thêm cho bulk_create (upsert)
+
+        Returns:
+            int: Số lượng business đã lưu
+        """
+        try:
+            with transaction.atomic():
+                Business.objects.bulk_create(businesses, batch_size=SAVE_BATCH_SIZE, **options)
+            return len(businesses)
+        except Exception as e:
+            logger.warning(f"Lỗi khi {action} {len(businesses)} business, thử lại từng dòng: {str(e)}")
+
+        saved_count = 0
+        for business in businesses:
+            try:
+                with transaction.atomic():
+                    Business.objects.bulk_create([business], **options)
+                saved_count += 1
+            except Exception as e:
+                logger.error(f"Lỗi khi {action} business {business.name}: {str(e)}")
         return saved_count
 
     @staticmethod
@@ -259,45 +484,61 @@ class BusinessScraperService:
         Returns:
             SearchQuery: Object search query
         """
-        return await sync_to_async(
-            SearchQuery.objects.prefetch_related('businesses').get
-        )(id=search_query_id)
+        return await SearchQuery.objects.prefetch_related('businesses').aget(id=search_query_id)
 
     @staticmethod
-    async def get_all_search_queries() -> List[SearchQuery]:
+    def get_all_search_queries(cursor: Optional[int] = None, limit: int = 100) -> AsyncIterator[Dict]:
         """
-        Lấy tất cả search queries
+        Lấy một trang search queries, mới nhất trước (keyset pagination theo id)
+
+        Args:
+            cursor: Chỉ lấy các bản ghi có id < cursor (None = trang đầu)
+            limit: Số bản ghi tối đa
 
         Returns:
-            List[SearchQuery]: Danh sách search queries
+            AsyncIterator[Dict]: Các dòng search query dạng dict
         """
-        return await sync_to_async(list)(
-            SearchQuery.objects.all().order_by('-created_at')
-        )
+        qs = SearchQuery.objects.order_by('-id')
+        if cursor is not None:
+            qs = qs.filter(id__lt=cursor)
+        return qs.values(*SEARCH_QUERY_FIELDS)[:limit].aiterator(chunk_size=LIST_CHUNK_SIZE)
 
     @staticmethod
-    async def get_all_businesses() -> List[Business]:
+    def get_all_businesses(cursor: Optional[int] = None, limit: int = 100) -> AsyncIterator[Dict]:
         """
-        Lấy tất cả businesses
+        Lấy một trang businesses, mới nhất trước (keyset pagination theo id)
+
+        Args:
+            cursor: Chỉ lấy các bản ghi có id < cursor (None = trang đầu)
+            limit: Số bản ghi tối đa
 
         Returns:
-            List[Business]: Danh sách businesses
+            AsyncIterator[Dict]: Các dòng business dạng dict
         """
-        return await sync_to_async(list)(
-            Business.objects.select_related('search_query').all().order_by('-created_at')
-        )
+        qs = Business.objects.order_by('-id')
+        if cursor is not None:
+            qs = qs.filter(id__lt=cursor)
+        return qs.values(*BUSINESS_FIELDS)[:limit].aiterator(chunk_size=LIST_CHUNK_SIZE)
 
     @staticmethod
-    async def search_businesses_by_keyword(keyword: str) -> List[Business]:
+    def search_businesses_by_keyword(keyword: str) -> AsyncIterator[Dict]:
         """
-        Tìm kiếm businesses theo keyword trong database
+        Tìm kiếm businesses theo keyword trong database (stream theo từng chunk)
 
         Args:
             keyword: Từ khóa tìm kiếm
 
         Returns:
-            List[Business]: Danh sách businesses
+            AsyncIterator[Dict]: Các dòng business dạng dict
         """
-        return await sync_to_async(list)(
-            Business.objects.filter(name__icontains=keyword).order_by('-created_at')
-        )
+        return Business.objects.filter(name__icontains=keyword).values(
+            *BUSINESS_FIELDS
+        ).order_by('-created_at').aiterator(chunk_size=LIST_CHUNK_SIZE)
+
+
+@lru_cache(maxsize=1)
+def get_scraper_service() -> BusinessScraperService:
+    """
+    Shared BusinessScraperService instance (tạo một lần khi cần dùng lần đầu)
+    """
+    return BusinessScraperService()
@@ -0,0 +1,16 @@
+"""
+Signal handlers cho Business Scraper
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import SearchQuery, Business
+from .response_cache import bump_list_cache_version
+
+
+@receiver(post_save, sender=SearchQuery)
+@receiver(post_delete, sender=SearchQuery)
+@receiver(post_save, sender=Business)
+def invalidate_list_cache(sender, **kwargs):
+    # Không gắn post_delete cho Business: signal đó sẽ tắt fast-delete khi
+    # xóa SearchQuery (Django phải load từng business để gửi signal)
+    bump_list_cache_version()
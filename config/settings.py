@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # OpClass indexes
     'corsheaders',  # Added for CORS support
     'business_scraper',
 ]
@@ -113,10 +114,35 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Gemini answers per page text, kept on disk across runs and restarts.
+    # The periodic-cull backend scans the directory every CULL_EVERY writes
+    # (dropping expired entries first) instead of on every write
+    'gemini': {
+        'BACKEND': 'business_scraper.file_cache.PeriodicCullFileBasedCache',
+        'LOCATION': os.getenv('GEMINI_CACHE_DIR', str(BASE_DIR / '.cache' / 'gemini')),
+        'TIMEOUT': int(os.getenv('GEMINI_CACHE_TTL', str(7 * 24 * 3600))),
+        'OPTIONS': {'MAX_ENTRIES': 10000, 'CULL_EVERY': 200},
+    },
+    # HSCTVN detail page fields per company URL (status/phone change rarely)
+    'hsctvn': {
+        'BACKEND': 'business_scraper.file_cache.PeriodicCullFileBasedCache',
+        'LOCATION': os.getenv('HSCTVN_CACHE_DIR', str(BASE_DIR / '.cache' / 'hsctvn')),
+        'TIMEOUT': int(os.getenv('HSCTVN_CACHE_TTL', str(3 * 24 * 3600))),
+        'OPTIONS': {'MAX_ENTRIES': 50000, 'CULL_EVERY': 1000},
+    },
+}
+
 # Scraper Settings
 SCRAPER_HEADLESS = os.getenv('SCRAPER_HEADLESS', 'True') == 'True'
 SCRAPER_TIMEOUT = int(os.getenv('SCRAPER_TIMEOUT', '30000'))
 MAX_RESULTS_PER_SEARCH = int(os.getenv('MAX_RESULTS_PER_SEARCH', '20'))
+# Google Maps place pages opened at once (higher values risk rate limiting)
+GOOGLE_MAPS_CONCURRENCY = int(os.getenv('GOOGLE_MAPS_CONCURRENCY', '5'))
 
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
@@ -1,22 +1,53 @@
 """
 URL configuration for the project.
 """
+import logging
 from django.contrib import admin
 from django.urls import path
 from ninja import NinjaAPI
 from business_scraper.api import router as business_router
+from business_scraper.renderers import ORJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = 'api/'
+
+
+class CachedSchemaNinjaAPI(NinjaAPI):
+    """NinjaAPI that builds the OpenAPI schema once per path prefix (Ninja rebuilds it on every request)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._openapi_schemas = {}
+
+    def get_openapi_schema(self, *, path_prefix=None, path_params=None):
+        if path_prefix is None:
+            path_prefix = self.get_root_path(path_params or {})
+        schema = self._openapi_schemas.get(path_prefix)
+        if schema is None:
+            schema = self._openapi_schemas[path_prefix] = super().get_openapi_schema(path_prefix=path_prefix)
+        return schema
+
 
 # Create Ninja API instance
-api = NinjaAPI(
+api = CachedSchemaNinjaAPI(
     title="Google Maps Business Scraper API",
     version="1.0.0",
-    description="API để scrape thông tin doanh nghiệp từ Google Maps và lưu vào database"
+    description="API để scrape thông tin doanh nghiệp từ Google Maps và lưu vào database",
+    renderer=ORJSONRenderer()
 )
 
 # Register routers
 api.add_router("/business/", business_router)
 
+# Build the schema now so the first /api/openapi.json (docs page) request
+# doesn't pay for it
+try:
+    api.get_openapi_schema(path_prefix=f'/{API_PREFIX}')
+except Exception as e:
+    logger.warning(f"OpenAPI schema prewarm failed: {e}")
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', api.urls),
+    path(API_PREFIX, api.urls),
 ]